@@ -9,8 +9,11 @@ import datetime
 
 import flask
 import sqlalchemy
+import sqlalchemy.event
 import sqlalchemy.orm
+import sqlalchemy.pool
 import sqlalchemy.ext.declarative
+import sqlalchemy.ext.hybrid
 import jsonapi
 import jsonapi.flask
 import jsonapi.sqlalchemy
@@ -21,7 +24,26 @@ import jsonapi.sqlalchemy
 
 Base = sqlalchemy.ext.declarative.declarative_base()
 
-engine = sqlalchemy.create_engine("sqlite:////tmp/blog")#+datetime.datetime.utcnow().ctime())
+engine = sqlalchemy.create_engine(
+    "sqlite:////tmp/blog",
+    connect_args={"check_same_thread": False},
+    poolclass=sqlalchemy.pool.QueuePool
+)
+
+
+@sqlalchemy.event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Enables SQLite's write-ahead log, so that readers don't block writers and
+    a commit does not require a full fsync.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+    return None
 
 Session = sqlalchemy.orm.sessionmaker()
 Session.configure(bind=engine)
@@ -34,14 +56,26 @@ class User(Base):
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     name = sqlalchemy.Column("name", sqlalchemy.String(50), nullable=False)
 
-    @jsonapi.marker.method.attribute()
+    # The first name is derived from the name. It is read-only, because it
+    # has no setter, but it can be used for sorting and filtering, since the
+    # expression is computed by the database.
+    @sqlalchemy.ext.hybrid.hybrid_property
     def first_name(self):
-        return self.name.split()[0]
+        return self.name.split(" ")[0]
+
+    @first_name.expression
+    def first_name(cls):
+        return sqlalchemy.func.substr(
+            cls.name, 1, sqlalchemy.func.instr(cls.name + " ", " ") - 1
+        )
 
 
 class Post(Base):
 
     __tablename__ = "posts"
+    __table_args__ = (
+        sqlalchemy.Index("ix_posts_author_id_id", "author_id", "id"),
+    )
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     text = sqlalchemy.Column(sqlalchemy.Text, nullable=False)
@@ -57,6 +91,10 @@ class Post(Base):
 class Comment(Base):
 
     __tablename__ = "comments"
+    __table_args__ = (
+        sqlalchemy.Index("ix_comments_author_id_id", "author_id", "id"),
+        sqlalchemy.Index("ix_comments_post_id_id", "post_id", "id")
+    )
 
     id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
     text = sqlalchemy.Column(sqlalchemy.Text, nullable=False)
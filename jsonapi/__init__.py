@@ -22,8 +22,39 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+# std
+import importlib
+
 # local
 from . import base
-from . import asyncio
 from . import marker
 from . import version
+
+
+#: The subpackages, which are only imported on first access, e.g.
+#: ``jsonapi.sqlalchemy``. Most applications use only one database adapter
+#: and one web framework, so we don't want to pay for the others.
+LAZY_SUBPACKAGES = frozenset([
+    "asyncio",
+    "bulk_database",
+    "flask",
+    "mongoengine",
+    "motorengine",
+    "sqlalchemy",
+    "tornado"
+])
+
+
+def __getattr__(name):
+    """
+    Imports the subpackage *name* on first access.
+
+    :seealso: https://www.python.org/dev/peps/pep-0562/
+    """
+    if name not in LAZY_SUBPACKAGES:
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name)
+        )
+    module = importlib.import_module("." + name, __name__)
+    globals()[name] = module
+    return module
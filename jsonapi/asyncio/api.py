@@ -31,11 +31,14 @@ API base application for asynchronous web frameworks.
 
 # std
 import asyncio
+import concurrent.futures
 import logging
 
 # local
 import jsonapi
 from jsonapi.base import errors
+from jsonapi.base.utilities import document_size
+from . import database
 from . import handler
 from . import serializer
 
@@ -48,23 +51,95 @@ __all__ = [
 LOG = logging.getLogger(__file__)
 
 
+#: Documents with more resource objects are encoded in a thread by
+#: :meth:`API.dump_json_async`, so that the event loop is not blocked.
+EXECUTOR_DUMP_SIZE = 32
+
+
 class API(jsonapi.base.api.API):
     """
     Overrides the base API to support asynchronous web frameworks.
     """
 
+    def __init__(self, uri, db, debug=False, settings=None):
+        """
+        """
+        super().__init__(uri=uri, db=db, debug=debug, settings=settings)
+
+        # The thread pool used by :meth:`dump_json_async`.
+        self._dump_json_executor = None
+
+        # True, if we have already warned about a synchronous database.
+        self._warned_sync_db = False
+        return None
+
     def _create_routes(self):
         """
         We use our own *asynchronous* handlers. So we have to override this
         method.
         """
         uris = jsonapi.base.api.build_uris(self._uri)
-        self._routes.extend([
-            (uris["collection"], handler.CollectionHandler),
-            (uris["related"], handler.RelatedHandler),
-            (uris["resource"], handler.ResourceHandler),
-            (uris["relationships"], handler.RelationshipHandler)
-        ])
+        self._add_route(uris["collection"], handler.CollectionHandler)
+        self._add_route(uris["related"], handler.RelatedHandler)
+        self._add_route(uris["resource"], handler.ResourceHandler)
+        self._add_route(uris["relationships"], handler.RelationshipHandler)
+        return None
+
+    def _session(self):
+        """
+        Returns a new database session. A synchronous session is wrapped in a
+        :class:`~jsonapi.asyncio.database.SyncToAsyncSession`, so that the
+        database calls don't block the event loop.
+        """
+        session = self._db.session()
+        if not isinstance(session, database.Session):
+            if not self._warned_sync_db:
+                LOG.warning(
+                    "The database adapter '%s' is synchronous. The database "
+                    "calls are run in a thread pool. Use an asynchronous "
+                    "adapter, e.g. jsonapi.motorengine, if possible.",
+                    type(self._db).__module__
+                )
+                self._warned_sync_db = True
+            session = database.SyncToAsyncSession(session)
+        return session
+
+    @property
+    def dump_json_executor(self):
+        """
+        The thread pool, in which large documents are encoded. The pool is
+        created on first use.
+        """
+        if self._dump_json_executor is None:
+            self._dump_json_executor = concurrent.futures.ThreadPoolExecutor()
+        return self._dump_json_executor
+
+    async def dump_json_async(self, d):
+        """
+        Encodes the object *d* with :meth:`dump_json`. Large documents (see
+        :data:`EXECUTOR_DUMP_SIZE`) are encoded in a thread pool, so that the
+        event loop can handle other requests in the meantime.
+
+        :arg d:
+        """
+        if document_size(d) <= EXECUTOR_DUMP_SIZE:
+            return self.dump_json(d)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.dump_json_executor, self.dump_json, d
+        )
+
+    async def write_document_async(self, response, d):
+        """
+        The asynchronous version of
+        :meth:`~jsonapi.base.api.API.write_document`. The document is encoded
+        with :meth:`dump_json_async`.
+
+        :arg jsonapi.base.response.Response response:
+        :arg dict d:
+        """
+        response.body = await self.dump_json_async(d)
         return None
 
     def add_type(self, schema, **kargs):
@@ -78,8 +153,7 @@ class API(jsonapi.base.api.API):
         super().add_type(schema, **kargs)
         return None
 
-    @asyncio.coroutine
-    def handle_request(self, request):
+    async def handle_request(self, request):
         """
         """
         request.api = self
@@ -87,15 +161,13 @@ class API(jsonapi.base.api.API):
         try:
             HandlerType = self._find_handler(request)
             handler = HandlerType(
-                api=self, db=self._db.session(), request=request
+                api=self, db=self._session(), request=request
             )
 
-            yield from handler.prepare()
-            yield from handler.handle()
+            await handler.prepare()
+            await handler.handle()
         except (errors.Error, errors.ErrorList) as err:
-            #LOG.debug(err, exc_info=False)
-            print("DEBUG", self.debug)
-            print()
+            LOG.debug(err, exc_info=False)
             if not self.debug:
                 return errors.error_to_response(err, self.dump_json)
             else:
@@ -31,16 +31,18 @@ Defines the interface for an asynchronous database adapters.
 
 # std
 import asyncio
+import functools
+import itertools
 
 # local
 import jsonapi
-from jsonapi.base import errors
-from jsonapi.base.utilities import relative_identifiers
+from jsonapi.base.utilities import walk_include_paths
 
 
 __all__ = [
     "Database",
-    "Session"
+    "Session",
+    "SyncToAsyncSession"
 ]
 
 
@@ -60,43 +62,214 @@ class Session(jsonapi.base.database.Session):
     *   :meth:`query_size`
     *   :meth:`get`
     *   :meth:`get_many`
+    *   :meth:`get_many_iter` (an asynchronous generator)
     *   :meth:`commit`
+    *   :meth:`get_with_relatives`
     *   :meth:`get_relatives`
     """
 
-    @asyncio.coroutine
-    def get_relatives(self, resources, paths):
+    async def get(self, identifier, required=False):
+        """
+        **May be overridden**
+
+        Forwards to :meth:`get_many`.
+
+        :seealso: :meth:`jsonapi.base.database.Session.get`
+        """
+        resources = await self.get_many([identifier], required=required)
+        return resources.get(identifier)
+
+    async def get_many_iter(self, identifiers, required=False, chunk_size=500):
+        """
+        **May be overridden**
+
+        Does the same as :meth:`jsonapi.base.database.Session.get_many_iter`,
+        but is an asynchronous generator:
+
+        .. code-block:: python3
+
+            async for identifier, resource in db.get_many_iter(identifiers):
+                pass
+        """
+        identifiers = iter(identifiers)
+        while True:
+            chunk = list(itertools.islice(identifiers, chunk_size))
+            if not chunk:
+                break
+            resources = await self.get_many(chunk, required=required)
+            for item in resources.items():
+                yield item
+
+    async def get_with_relatives(self, identifier, paths, required=False):
+        """
+        **May be overridden** for performance reasons.
+
+        Does the same as
+        :meth:`jsonapi.base.database.Session.get_with_relatives`, but
+        asynchronous.
+        """
+        resource = await self.get(identifier, required)
+        if resource is None:
+            return (None, dict())
+        return (resource, await self.get_relatives([resource], paths))
+
+    async def get_relatives(self, resources, paths):
         """
         **May be overridden** for performance reasons.
 
         Does the same as :meth:`jsonapi.base.database.Session.get_relatives`,
         but asynchronous.
+        """
+        # Nothing to include (the common case).
+        if not paths or not resources:
+            return dict()
+
+        # The walk yields the missing identifiers of each level and expects
+        # the loaded resources in return.
+        walk = walk_include_paths(resources, paths)
+        try:
+            missing = next(walk)
+            while True:
+                fetched = await self.get_many(missing, required=True)
+                missing = walk.send(fetched)
+        except StopIteration as err:
+            return err.value
+
+
+class SyncToAsyncSession(Session):
+    """
+    Wraps a **synchronous** session (e.g. of the mongoengine or sqlalchemy
+    adapter), so that it can be used with an asynchronous API. All database
+    calls are run in the *executor*, so they don't block the event loop.
+
+    The calls of one session never run at the same time, because most
+    synchronous sessions are not thread safe. :meth:`save` and :meth:`delete`
+    must not block, so they are only recorded and replayed in the executor
+    right before the commit.
+
+    .. warning::
+
+        The resources are serialized on the event loop. Attributes and
+        relationships, which are loaded lazily by the synchronous session
+        (e.g. sqlalchemy or mongoengine), do their IO on the event loop
+        thread and outside of the lock. The asyncio handlers therefore never
+        serialize a resource while a call of the same session is running,
+        but you should eager-load everything, which is needed for the
+        serialization.
+
+    :arg jsonapi.base.database.Session session:
+        The synchronous session
+    :arg concurrent.futures.Executor executor:
+        The executor for the database calls. If None, the default executor of
+        the event loop is used.
+    """
+
+    def __init__(self, session, executor=None):
+        super().__init__(session.api)
+        self.session = session
+        self.executor = executor
+
+        # Serializes the calls, which are sent to the executor.
+        self._lock = asyncio.Lock()
+
+        # The save() and delete() calls, which have not been sent to the
+        # session yet: A list of *(method, resources)* tuples.
+        self._pending = list()
+        return None
+
+    async def _run(self, func, *args, **kargs):
+        """
+        Calls *func* in the executor and returns its result.
+
+        A running executor call can not be stopped. So if the awaiting task is
+        cancelled, the lock is held until the call has finished, because the
+        session is still used by the worker thread.
+        """
+        await self._lock.acquire()
+        try:
+            loop = asyncio.get_event_loop()
+            future = loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kargs)
+            )
+        except:
+            self._lock.release()
+            raise
 
-        .. todo::
-
-            Fetch the different paths in *paths* parallel.
-        """
-        all_relatives = dict()
-        root_resources = resources
-
-        for path in paths:
-            resources = root_resources
-            for relname in path:
-                # Collect the ids of all related resources.
-                relids = set()
-                for resource in resources:
-                    try:
-                        tmp = relative_identifiers(relname, resource)
-                    except errors.RelationshipNotFound:
-                        raise errors.UnresolvableIncludePath(path)
-                    else:
-                        relids.update(tmp)
-
-                # Query the relatives from the database.
-                relatives = yield from self.get_many(relids, required=True)
-                all_relatives.update(relatives)
-
-                # The next relationship name in the path is defined on the
-                # previously fetched relatives.
-                resources = relatives.values()
-        return all_relatives
+        future.add_done_callback(self._release_lock)
+        return await asyncio.shield(future)
+
+    def _release_lock(self, future):
+        """
+        Releases the lock, when the executor call *future* of :meth:`_run` is
+        done.
+        """
+        # Retrieve the exception, so that it is not reported as unhandled,
+        # if the awaiting task has been cancelled.
+        if not future.cancelled():
+            future.exception()
+        self._lock.release()
+        return None
+
+    async def query(self, typename, **kargs):
+        """
+        """
+        return await self._run(self.session.query, typename, **kargs)
+
+    async def query_size(self, typename, **kargs):
+        """
+        """
+        return await self._run(self.session.query_size, typename, **kargs)
+
+    async def get(self, identifier, required=False):
+        """
+        """
+        return await self._run(self.session.get, identifier, required)
+
+    async def get_many(self, identifiers, required=False):
+        """
+        """
+        return await self._run(self.session.get_many, identifiers, required)
+
+    async def get_with_relatives(self, identifier, paths, required=False):
+        """
+        """
+        return await self._run(
+            self.session.get_with_relatives, identifier, paths, required
+        )
+
+    async def get_relatives(self, resources, paths):
+        """
+        """
+        return await self._run(self.session.get_relatives, resources, paths)
+
+    def save(self, resources):
+        """
+        Records the call. The resources are passed to the session in
+        :meth:`commit`.
+        """
+        self._pending.append((self.session.save, list(resources)))
+        return None
+
+    def delete(self, resources):
+        """
+        Records the call. The resources are passed to the session in
+        :meth:`commit`.
+        """
+        self._pending.append((self.session.delete, list(resources)))
+        return None
+
+    def _flush_and_commit(self, pending):
+        """
+        Replays the *pending* :meth:`save` and :meth:`delete` calls and
+        commits the session. Runs in the executor.
+        """
+        for func, resources in pending:
+            func(resources)
+        self.session.commit()
+        return None
+
+    async def commit(self):
+        """
+        """
+        pending, self._pending = self._pending, list()
+        return await self._run(self._flush_and_commit, pending)
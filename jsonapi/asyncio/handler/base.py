@@ -44,6 +44,12 @@ class BaseHandler(object):
     :arg jsonapi.base.request.Request request:
     """
 
+    __slots__ = ("api", "request", "response", "db")
+
+    #: The http methods (lower case), which are dispatched to the handler
+    #: method with the same name.
+    METHODS = frozenset(["head", "get", "post", "patch", "delete"])
+
     def __init__(self, api, db, request):
         """
         """
@@ -53,9 +59,11 @@ class BaseHandler(object):
         self.db = db
         return None
 
-    def prepare(self):
+    async def prepare(self):
         """
-        Called directly before :meth:`handle`.
+        Called directly before :meth:`handle`. This method must always be a
+        coroutine, so that the API can wait for it without checking its
+        type on every request.
         """
         return None
 
@@ -63,49 +71,35 @@ class BaseHandler(object):
         """
         Handles a requested and returns a asyncio.Future.
         """
-        if self.request.method == "head":
-            return asyncio.ensure_future(self.head())
-        elif self.request.method == "get":
-            return asyncio.ensure_future(self.get())
-        elif self.request.method == "post":
-            return asyncio.ensure_future(self.post())
-        elif self.request.method == "patch":
-            return asyncio.ensure_future(self.patch())
-        elif self.request.method == "delete":
-            return asyncio.ensure_future(self.delete())
-        else:
+        if not self.request.method in self.METHODS:
             raise MethodNotAllowed()
+        return asyncio.ensure_future(getattr(self, self.request.method)())
 
-    @asyncio.coroutine
-    def head(self):
+    async def head(self):
         """
         Handles a HEAD request.
         """
         raise MethodNotAllowed()
 
-    @asyncio.coroutine
-    def get(self):
+    async def get(self):
         """
         Handles a GET request.
         """
         raise MethodNotAllowed()
 
-    @asyncio.coroutine
-    def post(self):
+    async def post(self):
         """
         Handles a POST request.
         """
         raise MethodNotAllowed()
 
-    @asyncio.coroutine
-    def patch(self):
+    async def patch(self):
         """
         Handles a PATCH request.
         """
         raise MethodNotAllowed()
 
-    @asyncio.coroutine
-    def delete(self):
+    async def delete(self):
         """
         Handles a DELETE request.
         """
@@ -29,13 +29,13 @@ jsonapi.asyncio.handler.collection
 
 # std
 import asyncio
-from collections import OrderedDict
 
 # local
 from jsonapi.base import errors
 from jsonapi.base import validators
+from jsonapi.base.request import JSONAPI_MEDIA_TYPE
 from jsonapi.base.serializer import serialize_many
-from jsonapi.base.pagination import Pagination
+from jsonapi.base.pagination import Pagination, KeysetPagination
 from .base import BaseHandler
 
 
@@ -44,6 +44,8 @@ class CollectionHandler(BaseHandler):
     Handles the collection endpoint.
     """
 
+    __slots__ = ("typename",)
+
     def __init__(self, api, db, request):
         """
         """
@@ -51,18 +53,16 @@ class CollectionHandler(BaseHandler):
         self.typename = request.japi_uri_arguments.get("type")
         return None
 
-    @asyncio.coroutine
-    def prepare(self):
+    async def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
         return None
 
-    @asyncio.coroutine
-    def get(self):
+    async def get(self):
         """
         Handles a GET request. This means to fetch many resourcs from the
         collection and return it.
@@ -70,99 +70,167 @@ class CollectionHandler(BaseHandler):
         http://jsonapi.org/format/#fetching-resources
         """
         # Fetch the requested resources.
+        after = self.request.japi_page_after
         if self.request.japi_paginate:
             offset = self.request.japi_page_offset
             limit = self.request.japi_page_limit
+        elif after is not None:
+            offset = None
+            limit = self.request.japi_page_size or self.request.japi_limit
         else:
             offset = self.request.japi_offset
             limit = self.request.japi_limit
 
-        resources = yield from self.db.query(
-            self.typename, order=self.request.japi_sort, limit=limit,
-            offset=offset, filters=self.request.japi_filters
-        )
-
-        # Fetch all related resources, which should be included.
-        included_resources = yield from self.db.get_relatives(
-            resources, self.request.japi_include
-        )
-
-        # Build the response.
-        data = serialize_many(resources, fields=self.request.japi_fields)
-        included = serialize_many(
-            included_resources.values(), fields=self.request.japi_fields
-        )
-        meta = OrderedDict()
-        links = OrderedDict()
-
-        # Add the pagination links, if necessairy.
+        # The total number of resources does not depend on the page, so we
+        # count them while the page and the included resources are loaded.
+        size_task = None
         if self.request.japi_paginate:
-            total_resources = yield from self.db.query_size(
+            size_task = asyncio.ensure_future(self.db.query_size(
                 self.typename, filters=self.request.japi_filters
+            ))
+
+        try:
+            resources = await self.db.query(
+                self.typename, order=self.request.japi_sort, limit=limit,
+                offset=offset, filters=self.request.japi_filters, after=after
+            )
+
+            # Fetch all related resources, which should be included.
+            included_resources = await self.db.get_relatives(
+                resources, self.request.japi_include
             )
 
-            pagination = Pagination(self.request, total_resources)
-            meta.update(pagination.json_meta)
-            links.update(pagination.json_links)
+            # Build the response.
+            data = serialize_many(resources, fields=self.request.japi_fields)
+            included = serialize_many(
+                included_resources.values(), fields=self.request.japi_fields
+            )
+            meta = dict()
+            links = dict()
+
+            # Add the pagination links, if necessairy.
+            if self.request.japi_paginate:
+                total_resources = await size_task
+                pagination = Pagination(self.request, total_resources)
+                meta.update(pagination.json_meta)
+                links.update(pagination.json_links)
+            elif after is not None:
+                pagination = KeysetPagination(
+                    self.request, data[-1]["id"] if data else None, len(data)
+                )
+                meta.update(pagination.json_meta)
+                links.update(pagination.json_links)
+        finally:
+            # Don't leave the count running, if something went wrong. A
+            # synchronous session (SyncToAsyncSession) stays locked until the
+            # call in the executor has finished.
+            if size_task is not None and not size_task.done():
+                size_task.cancel()
 
         # Put all together
         self.response.headers["content-type"] = "application/vnd.api+json"
         self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        await self.api.write_document_async(self.response, {
+            "data": data,
+            "included": included,
+            "meta": meta,
+            "links": links,
+            "jsonapi": self.api.jsonapi_object
+        })
         return None
 
-    @asyncio.coroutine
-    def post(self):
+    async def post(self):
         """
         Handles a POST request. This means to create a new resource and to
         return it.
 
+        If the *bulk* extension is requested, *data* may also be a list of
+        resource objects. All resources are then created and committed at
+        once.
+
         http://jsonapi.org/format/#crud-creating
+        http://jsonapi.org/extensions/bulk/#creating-multiple-resources
         """
-        # Make sure the request contains a valid JSON resource object.
-        resource_object = self.request.json.get("data", dict())
-        validators.assert_resource_object(
-            resource_object, source_pointer="/data/"
-        )
+        # Make sure the request contains valid JSON resource objects.
+        resource_objects = self.request.json.get("data", dict())
+        bulk = isinstance(resource_objects, list)
+        if bulk:
+            if not "bulk" in self.request.japi_extensions:
+                raise errors.UnsupportedMediaType(
+                    detail="Use the 'bulk' extension to create many resources."
+                )
+            for i, resource_object in enumerate(resource_objects):
+                validators.assert_resource_object(
+                    resource_object, source_pointer="/data/{}/".format(i)
+                )
+        else:
+            validators.assert_resource_object(
+                resource_objects, source_pointer="/data/"
+            )
+            resource_objects = [resource_objects]
 
         # Check if the *type* is supported by this collection endpoint.
-        if resource_object["type"] != self.typename:
+        if any(resource_object["type"] != self.typename \
+            for resource_object in resource_objects):
             raise errors.Conflict()
 
-        # Create the new resource.
+        # Create the new resources. The relatives of the resources are
+        # loaded concurrently.
         unserializer = self.api.get_unserializer(self.typename)
-        resource = yield from unserializer.create_resource(
-            self.db, resource_object
-        )
+        if len(resource_objects) == 1:
+            resources = [
+                await unserializer.create_resource(self.db, resource_objects[0])
+            ]
+        else:
+            resources = await asyncio.gather(*[
+                unserializer.create_resource(self.db, resource_object)\
+                for resource_object in resource_objects
+            ], return_exceptions=True)
+
+            error_list = errors.ErrorList()
+            for resource in resources:
+                if isinstance(resource, errors.Error):
+                    error_list.append(resource)
+                elif isinstance(resource, errors.ErrorList):
+                    error_list.extend(resource)
+                elif isinstance(resource, BaseException):
+                    raise resource
+            if error_list:
+                raise error_list
 
         # Save the resources.
-        self.db.save([resource])
-        yield from self.db.commit()
+        self.db.save(resources)
+        await self.db.commit()
 
         # Crate the response.
         serializer = self.api.get_serializer(self.typename)
-        data = serializer.serialize_resource(
-            resource, fields=self.request.japi_fields.get(self.typename)
-        )
+        fields = self.request.japi_fields.get(self.typename)
 
-        links = data.setdefault("links", dict())
-        links["self"] = self.api.reverse_url(
-            typename=self.typename, endpoint="resource", id=data["id"]
-        )
+        data = list()
+        for resource in resources:
+            tmp = serializer.serialize_resource(resource, fields=fields)
+            tmp.setdefault("links", dict())["self"] = self.api.reverse_url(
+                typename=self.typename, endpoint="resource", id=tmp["id"]
+            )
+            data.append(tmp)
 
         # Put everything together.
-        self.response.headers["content-type"] = "application/vnd.api+json"
-        self.response.headers["location"] = links["self"]
-        self.response.status_code = 201
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        if bulk:
+            self.response.headers["content-type"] = \
+                "application/vnd.api+json; ext=\"bulk\""
+            self.response.status_code = 201
+            self.response.body = self.api.dump_json({
+                "data": data,
+                "jsonapi": self.api.jsonapi_object
+            })
+        else:
+            links = data[0]["links"]
+            self.response.headers["content-type"] = "application/vnd.api+json"
+            self.response.headers["location"] = links["self"]
+            self.response.status_code = 201
+            self.response.body = self.api.dump_json({
+                "data": data[0],
+                "links": links,
+                "jsonapi": self.api.jsonapi_object
+            })
         return None
@@ -27,12 +27,9 @@ jsonapi.asyncio.handler.related
 ===============================
 """
 
-# std
-import asyncio
-from collections import OrderedDict
-
 # local
 from jsonapi.base import errors
+from jsonapi.base.request import JSONAPI_MEDIA_TYPE
 from jsonapi.base.serializer import serialize_many
 from .base import BaseHandler
 
@@ -42,6 +39,8 @@ class RelatedHandler(BaseHandler):
     Returns the related resources for the resource.
     """
 
+    __slots__ = ("typename", "relname", "real_typename", "resource_id", "resource")
+
     def __init__(self, api, db, request):
         """
         """
@@ -57,53 +56,51 @@ class RelatedHandler(BaseHandler):
         self.resource = None
         return None
 
-    @asyncio.coroutine
-    def prepare(self):
+    async def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
 
         # Load the resource.
-        self.resource = yield from self.db.get((self.typename, self.resource_id))
+        self.resource = await self.db.get((self.typename, self.resource_id))
         if self.resource is None:
             raise errors.NotFound()
 
         self.real_typename = self.api.get_typename(self.resource)
         return None
 
-    @asyncio.coroutine
-    def get(self):
+    async def get(self):
         """
         Handles a GET request.
 
         http://jsonapi.org/format/#fetching-relationships
         """
-        resources = yield from self.db.get_relatives([self.resource], [[self.relname]])
-        resources = resources.values()
-
-        included_resources = yield from self.db.get_relatives(
+        resources = await self.db.get_relatives([self.resource], [[self.relname]])
+        resources = list(resources.values())
+
+        # The relatives are serialized only after the included resources have
+        # been fetched. A synchronous session (*SyncToAsyncSession*) may load
+        # attributes lazily during the serialization, which must not happen
+        # while the session is busy in the executor.
+        included_resources = await self.db.get_relatives(
             resources, self.request.japi_include
         )
-
-        # Build the document.
         data = serialize_many(resources, fields=self.request.japi_fields)
         included = serialize_many(
             included_resources.values(), fields=self.request.japi_fields
         )
-        meta = OrderedDict()
-        links = OrderedDict()
 
         # Create the response
         self.response.headers["content-type"] = "application/vnd.api+json"
         self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        await self.api.write_document_async(self.response, {
+            "data": data,
+            "included": included,
+            "meta": {},
+            "links": {},
+            "jsonapi": self.api.jsonapi_object
+        })
         return None
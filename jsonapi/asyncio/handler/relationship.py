@@ -27,13 +27,10 @@ jsonapi.asyncio.handler.relationship
 ====================================
 """
 
-# std
-import asyncio
-from collections import OrderedDict
-
 # local
 from jsonapi.base import errors
 from jsonapi.base import validators
+from jsonapi.base.request import JSONAPI_MEDIA_TYPE
 from jsonapi.base.serializer import serialize_many
 from .base import BaseHandler
 
@@ -43,6 +40,11 @@ class RelationshipHandler(BaseHandler):
     Handles the relationship endpoint.
     """
 
+    __slots__ = (
+        "typename", "relname", "real_typename", "resource_id", "resource",
+        "relationship"
+    )
+
     def __init__(self, api, db, request):
         """
         """
@@ -58,17 +60,16 @@ class RelationshipHandler(BaseHandler):
         self.resource = None
         return None
 
-    @asyncio.coroutine
-    def prepare(self):
+    async def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
 
         # Load the resource.
-        self.resource = yield from self.db.get((self.typename, self.resource_id))
+        self.resource = await self.db.get((self.typename, self.resource_id))
         if self.resource is None:
             raise errors.NotFound()
 
@@ -91,7 +92,7 @@ class RelationshipHandler(BaseHandler):
             self.resource, self.relname
         )
 
-        links = document.setdefault("links", OrderedDict())
+        links = document.setdefault("links", dict())
         links["self"] = self.api.reverse_url(
             typename=self.typename, endpoint="relationship",
             id=self.resource_id, relname=self.relname
@@ -106,8 +107,7 @@ class RelationshipHandler(BaseHandler):
         body = self.api.dump_json(document)
         return body
 
-    @asyncio.coroutine
-    def get(self):
+    async def get(self):
         """
         Handles a GET request.
 
@@ -118,8 +118,7 @@ class RelationshipHandler(BaseHandler):
         self.response.body = self.build_body()
         return None
 
-    @asyncio.coroutine
-    def post(self):
+    async def post(self):
         """
         Handles a POST request.
 
@@ -137,13 +136,13 @@ class RelationshipHandler(BaseHandler):
 
         # Extend the relationship.
         unserializer = self.api.get_unserializer(self.real_typename)
-        yield from unserializer.extend_relationship(
+        await unserializer.extend_relationship(
             self.db, self.resource, self.relname, relationship_object
         )
 
         # Save the resource.
         self.db.save([self.resource])
-        yield from self.db.commit()
+        await self.db.commit()
 
         # Build the response
         self.response.headers["content-type"] = "application/vnd.api+json"
@@ -151,8 +150,7 @@ class RelationshipHandler(BaseHandler):
         self.response.body = self.build_body()
         return None
 
-    @asyncio.coroutine
-    def patch(self):
+    async def patch(self):
         """
         Handles a PATCH request.
 
@@ -164,13 +162,13 @@ class RelationshipHandler(BaseHandler):
 
         # Patch the relationship.
         unserializer = self.api.get_unserializer(self.real_typename)
-        yield from unserializer.update_relationship(
+        await unserializer.update_relationship(
             self.db, self.resource, self.relname, relationship_object
         )
 
         # Save thte changes.
         self.db.save([self.resource])
-        yield from self.db.commit()
+        await self.db.commit()
 
         # Build the response
         self.response.headers["content-type"] = "application/vnd.api+json"
@@ -178,8 +176,7 @@ class RelationshipHandler(BaseHandler):
         self.response.body = self.build_body()
         return None
 
-    @asyncio.coroutine
-    def delete(self):
+    async def delete(self):
         """
         Handles a DELETE request.
         """
@@ -188,7 +185,7 @@ class RelationshipHandler(BaseHandler):
 
         # Save the changes
         self.db.save([self.resource])
-        yield from self.db.commit()
+        await self.db.commit()
 
         # Build the response
         self.response.headers["content-type"] = "application/vnd.api+json"
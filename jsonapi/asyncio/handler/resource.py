@@ -27,13 +27,10 @@ jsonapi.asyncio.handler.resource
 ================================
 """
 
-# std
-import asyncio
-from collections import OrderedDict
-
 # local
 from jsonapi.base import errors
 from jsonapi.base import validators
+from jsonapi.base.request import JSONAPI_MEDIA_TYPE
 from jsonapi.base.serializer import serialize_many
 from .base import BaseHandler
 
@@ -43,6 +40,11 @@ class ResourceHandler(BaseHandler):
     Handles a resource endpoint.
     """
 
+    __slots__ = (
+        "typename", "real_typename", "resource_id", "resource",
+        "included_resources"
+    )
+
     def __init__(self, api, db, request):
         """
         """
@@ -57,109 +59,124 @@ class ResourceHandler(BaseHandler):
         # We will load the resource in *prepare()*.
         self.resource_id = self.request.japi_uri_arguments.get("id")
         self.resource = None
+
+        # The included resources of a GET request are loaded together with
+        # the resource in *prepare()*.
+        self.included_resources = None
         return None
 
-    @asyncio.coroutine
-    def prepare(self):
+    async def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
 
         # Load the resource
-        self.resource = yield from self.db.get((self.typename, self.resource_id))
+        identifier = (self.typename, self.resource_id)
+        if self.request.method == "get" and self.request.japi_include:
+            self.resource, self.included_resources = \
+                await self.db.get_with_relatives(
+                    identifier, self.request.japi_include
+                )
+        else:
+            self.resource = await self.db.get(identifier)
         if self.resource is None:
             raise errors.NotFound()
 
         self.real_typename = self.api.get_typename(self.resource, None)
         return None
 
-    @asyncio.coroutine
-    def get(self):
+    async def get(self):
         """
         Handles a GET request.
 
         http://jsonapi.org/format/#fetching-resources
         """
-        # Fetch the included resources.
-        included_resources = yield from self.db.get_relatives(
-            [self.resource], self.request.japi_include
-        )
+        api = self.api
+        request = self.request
+        response = self.response
+        resource = self.resource
 
         # Build the response document.
-        serializer = self.api.get_serializer(self.real_typename)
+        serializer = api.get_serializer(self.real_typename)
         data = serializer.serialize_resource(
-            self.resource, fields=self.request.japi_fields.get(self.typename)
+            resource, fields=request.japi_fields.get(self.typename)
         )
 
-        included = serialize_many(
-            included_resources.values(), self.request.japi_fields
-        )
-
-        meta = OrderedDict()
-        links = OrderedDict()
+        # Fetch the included resources, if not already done in *prepare()*.
+        # Most requests include nothing, so we skip this step completely.
+        if request.japi_include:
+            included_resources = self.included_resources
+            if included_resources is None:
+                included_resources = await self.db.get_relatives(
+                    [resource], request.japi_include
+                )
+            included = serialize_many(
+                included_resources.values(), request.japi_fields
+            )
+        else:
+            included = []
 
         # Put all together
-        self.response.headers["content-type"] = "application/vnd.api+json"
-        self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        response.headers["content-type"] = "application/vnd.api+json"
+        response.status_code = 200
+        await api.write_document_async(response, {
+            "data": data,
+            "included": included,
+            "meta": {},
+            "links": {},
+            "jsonapi": api.jsonapi_object
+        })
         return None
 
-    @asyncio.coroutine
-    def patch(self):
+    async def patch(self):
         """
         Handles a PATCH request.
 
         http://jsonapi.org/format/#crud-updating
         """
-        data = self.request.json.get("data", dict())
+        api = self.api
+        request = self.request
+        response = self.response
+        resource = self.resource
+
+        data = request.json.get("data", dict())
         validators.assert_resource_object(data, source_pointer="/data/")
 
         # Get the unserializer
-        unserializer = self.api.get_unserializer(self.real_typename)
-        yield from unserializer.update_resource(self.db, self.resource, data)
+        unserializer = api.get_unserializer(self.real_typename)
+        await unserializer.update_resource(self.db, resource, data)
 
         # Save the resource
-        self.db.save([self.resource])
-        yield from self.db.commit()
+        self.db.save([resource])
+        await self.db.commit()
 
         # Create the response
-        serializer = self.api.get_serializer(self.real_typename)
+        serializer = api.get_serializer(self.real_typename)
         data = serializer.serialize_resource(
-            self.resource, fields=self.request.japi_fields.get(self.typename)
+            resource, fields=request.japi_fields.get(self.typename)
         )
 
-        included = list()
-        meta = OrderedDict()
-        links = OrderedDict()
-
         # Put all together.
-        self.response.headers["content-type"] = "application/vnd.api+json"
-        self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        response.headers["content-type"] = "application/vnd.api+json"
+        response.status_code = 200
+        response.body = api.dump_json({
+            "data": data,
+            "included": [],
+            "meta": {},
+            "links": {},
+            "jsonapi": api.jsonapi_object
+        })
         return None
 
-    @asyncio.coroutine
-    def delete(self):
+    async def delete(self):
         """
         Handles a DELETE request.
         """
         self.db.delete([self.resource])
-        yield from self.db.commit()
+        await self.db.commit()
 
         # Create the response.
         self.response.status_code = 204
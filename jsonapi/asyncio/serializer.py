@@ -30,12 +30,12 @@ Contains an *unserializer* that works with asynchronous database drivers.
 """
 
 # std
-import asyncio
 import logging
 
 # local
 import jsonapi
 from jsonapi.base import errors
+from jsonapi.base.serializer import EMPTY_OBJECT, MISSING
 
 
 __all__ = [
@@ -52,67 +52,30 @@ class Unserializer(jsonapi.base.serializer.Unserializer):
     with *await*.
     """
 
-    @asyncio.coroutine
-    def _load_relationships_object(self, db, relationships_object):
+    __slots__ = ()
+
+    async def _load_relationships_object(self, db, relationships_object):
         """
         The same as the base class method, but calls the *db* async.
         """
-        # Collect the identifiers.
-        identifiers = set()
-        for relname, relobj in relationships_object.items():
-            reldata = relobj.get("data")
-
-            # *to-one* relationship (with target)
-            # -> a single resource identifier object
-            if isinstance(reldata, dict):
-                identifiers.add((reldata["type"], reldata["id"]))
-
-            # *to-many* relationship
-            # -> a list of resource identifier objects
-            elif isinstance(reldata, list):
-                identifiers.update(
-                    (item["type"], item["id"]) for item in reldata
-                )
-
-        # Load the resources
-        relatives = yield from db.get_many(identifiers, required=True)
-
-        # Map the relationship names back to the related resources.
-        result = dict()
-        for relname, relobj in relationships_object.items():
-            if "data" in relobj:
-                reldata = relobj["data"]
-
-                # *to-one* relationship with no target
-                if reldata is None:
-                    result[relname] = None
-                # *to-one* relationship with target
-                elif isinstance(reldata, dict):
-                    identifier = (reldata["type"], reldata["id"])
-                    result[relname] = relatives[identifier]
-                # *to-many* relationship
-                elif isinstance(reldata, list):
-                    identifiers = [
-                        (item["type"], item["id"]) for item in reldata
-                    ]
-                    result[relname] = [
-                        relatives[identifier] for identifier in identifiers
-                    ]
-        return result
-
-    @asyncio.coroutine
-    def create_resource(self, db, resource_object):
+        identifiers, relationships = self._parse_relationships_object(
+            relationships_object
+        )
+        relatives = await db.get_many(identifiers, required=True)
+        return self._map_relatives(relationships, relatives)
+
+    async def create_resource(self, db, resource_object):
         """
         The same as the base class method, but calls *db* async.
         """
         assert resource_object["type"] == self.schema.typename
 
         # Load all relatives
-        relationships = resource_object.get("relationships", dict())
-        relationships = yield from self._load_relationships_object(db, relationships)
+        relationships = resource_object.get("relationships", EMPTY_OBJECT)
+        relationships = await self._load_relationships_object(db, relationships)
 
         # Get the attributes
-        attributes = resource_object.get("attributes", dict())
+        attributes = resource_object.get("attributes", EMPTY_OBJECT)
 
         # Create the new resource.
         fields = dict()
@@ -121,8 +84,7 @@ class Unserializer(jsonapi.base.serializer.Unserializer):
         resource = self.schema.constructor.create(**fields)
         return resource
 
-    @asyncio.coroutine
-    def update_resource(self, db, resource, resource_object):
+    async def update_resource(self, db, resource, resource_object):
         """
         The same as the base class method, but call the *db* async.
         """
@@ -141,57 +103,48 @@ class Unserializer(jsonapi.base.serializer.Unserializer):
             except errors.ErrorList as err:
                 error_list.extend(err)
 
-        # Update the relationships
+        # Update the relationships. The relatives of all relationships are
+        # loaded at once.
         if "relationships" in resource_object:
-            rels_object = resource_object["relationships"]
-            for rel_name, rel_object in rels_object.items():
-                try:
-                    yield from self.update_relationship(db, resource, rel_name, rel_object)
-                except errors.Error as err:
-                    error_list.append(err)
-                except errors.ErrorList as err:
-                    error_list.extend(err)
+            identifiers, relationships = self._parse_relationships_object(
+                resource_object["relationships"]
+            )
+            try:
+                relatives = await db.get_many(identifiers, required=True)
+            except errors.Error as err:
+                error_list.append(err)
+            except errors.ErrorList as err:
+                error_list.extend(err)
+            else:
+                schema_relationships = self.schema.relationships
+                relationships = self._map_relatives(relationships, relatives)
+                for rel_name, relatives in relationships.items():
+                    try:
+                        schema_relationships[rel_name].set(resource, relatives)
+                    except errors.Error as err:
+                        error_list.append(err)
+                    except errors.ErrorList as err:
+                        error_list.extend(err)
 
         if error_list:
             raise error_list
         return None
 
-    @asyncio.coroutine
-    def update_relationship(
+    async def update_relationship(
         self, db, resource, relationship_name, relationship_object
         ):
         """
         The same as the base class method, but calls the *db* async.
         """
         relationship = self.schema.relationships[relationship_name]
-
-        # Break if no data key is given.
-        if not "data" in relationship_object:
-            return None
-
-        # Update a *to-one* relationship
-        if relationship.to_one:
-            identifier = relationship_object["data"]
-            if identifier is None:
-                relative = None
-            else:
-                identifier = (identifier["type"], identifier["id"])
-                relative = yield from db.get(identifier, required=True)
-            relationship.set(resource, relative)
-
-        # Update a *to-many* relationship
-        else:
-            identifiers = relationship_object["data"]
-            identifiers = [(item["type"], item["id"]) for item in identifiers]
-
-            relatives = yield from db.get_many(identifiers, required=True)
-            relatives = list(relatives.values())
-
-            relationship.set(resource, relatives)
+        relatives = await self._load_relationships_object(
+            db, {relationship_name: relationship_object}
+        )
+        if relationship_name in relatives:
+            relationship.set(resource, relatives[relationship_name])
         return None
 
-    @asyncio.coroutine
-    def extend_relationship(
+    async def extend_relationship(
         self, db, resource, relationship_name, relationship_object
         ):
         """
@@ -200,14 +153,15 @@ class Unserializer(jsonapi.base.serializer.Unserializer):
         relationship = self.schema.relationships[relationship_name]
         assert relationship.to_many
 
-        if "data" in relationship_object:
+        identifiers = relationship_object.get("data", MISSING)
+        if identifiers is not MISSING:
             # Get the identifier tuples of the new relatives.
-            identifiers = relationship_object["data"]
             identifiers = [(item["type"], item["id"]) for item in identifiers]
 
-            # Load the new relatives.
-            relatives = yield from db.get_many(identifiers, required=True)
-            relatives = list(relatives.values())
+            # Load the new relatives. They are added in the order of the
+            # request document, not in the order of *get_many()*.
+            relatives = await db.get_many(identifiers, required=True)
+            relatives = [relatives[identifier] for identifier in identifiers]
 
             relationship.extend(resource, relatives)
         return None
@@ -43,14 +43,45 @@ API instance.
 .. automodule:: jsonapi.base.validators
 """
 
+# std
+import importlib
+
 # local
-from . import handler
-from . import api
-from . import database
 from . import errors
-from .request import Request
-from .response import Response
-from . import schema
-from . import serializer
-from . import utilities
-from . import validators
+
+
+#: Maps the lazy attributes of this package to ``(module, attribute)``. The
+#: module is imported on first access, so that e.g. a worker, which only
+#: needs :mod:`jsonapi.base.errors`, does not load the whole API.
+LAZY_ATTRIBUTES = {
+    "handler": (".handler", None),
+    "api": (".api", None),
+    "database": (".database", None),
+    "pagination": (".pagination", None),
+    "request": (".request", None),
+    "response": (".response", None),
+    "schema": (".schema", None),
+    "serializer": (".serializer", None),
+    "utilities": (".utilities", None),
+    "validators": (".validators", None),
+    "Request": (".request", "Request"),
+    "Response": (".response", "Response")
+}
+
+
+def __getattr__(name):
+    """
+    Imports the submodule for the attribute *name* on first access.
+
+    :seealso: https://www.python.org/dev/peps/pep-0562/
+    """
+    if name not in LAZY_ATTRIBUTES:
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name)
+        )
+    module_name, attribute = LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name, __name__)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
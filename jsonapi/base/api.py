@@ -32,10 +32,13 @@ types.
 
 # std
 from collections import OrderedDict
+import decimal
+import functools
 import json
 import logging
 import re
 import urllib.parse
+import weakref
 
 # thid party
 try:
@@ -44,11 +47,32 @@ try:
 except ImportError:
     bson = None
 
+# The bson json hooks, if bson is installed.
+bson_default = bson.json_util.default if bson else None
+bson_object_hook = bson.json_util.object_hook if bson else None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.Fragment has been added in orjson 3.9.
+orjson_fragment = getattr(orjson, "Fragment", None)
+
+# The options for orjson.dumps() in the normal and in the debug mode.
+if orjson is not None:
+    ORJSON_OPTION = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z \
+        | orjson.OPT_NON_STR_KEYS
+    ORJSON_DEBUG_OPTION = ORJSON_OPTION | orjson.OPT_INDENT_2
+else:
+    ORJSON_OPTION = ORJSON_DEBUG_OPTION = None
+
 # local
 from .. import version
 from . import errors
 from . import handler
 from . import serializer
+from .utilities import iter_document
 
 
 __all__ = [
@@ -63,29 +87,100 @@ LOG = logging.getLogger(__file__)
 ARG_DEFAULT = []
 
 
+def _orjson_default(obj):
+    """
+    The *default* hook for :func:`orjson.dumps`. It handles the types, which
+    are not natively supported by :mod:`orjson`.
+    """
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if bson_default is not None:
+        return bson_default(obj)
+    raise TypeError("{!r} is not JSON serializable".format(obj))
+
+
+#: Matches a typename or relationship name in an endpoint uri.
+NAME_PATTERN = "[A-Za-z_][A-Za-z0-9_]*"
+
+#: Matches a resource id in an endpoint uri.
+ID_PATTERN = "[A-Za-z0-9_]+"
+
+#: The uri templates of the endpoints, relative to the base uri of the API.
+#: A trailing "/" is optional.
+COLLECTION_PATTERN = "/(?P<type>" + NAME_PATTERN + ")/?"
+RESOURCE_PATTERN = "/(?P<type>" + NAME_PATTERN + ")/(?P<id>" + ID_PATTERN + ")/?"
+RELATIONSHIPS_PATTERN = "/(?P<type>" + NAME_PATTERN + ")"\
+    "/(?P<id>" + ID_PATTERN + ")/relationships/(?P<relname>" + NAME_PATTERN + ")/?"
+RELATED_PATTERN = "/(?P<type>" + NAME_PATTERN + ")"\
+    "/(?P<id>" + ID_PATTERN + ")/(?P<relname>" + NAME_PATTERN + ")/?"
+
+
+NAME_RE = re.compile(NAME_PATTERN)
+ID_RE = re.compile(ID_PATTERN)
+
+
+def split_endpoint_path(path):
+    """
+    Splits the *path* of a request, relative to the base uri of the API, and
+    returns a tuple ``(endpoint type, uri arguments)``, if it matches one of
+    the default endpoints. Otherwise, None is returned.
+
+    This does the same as the regular expressions of :func:`build_uris`,
+    but only needs one :meth:`str.split` and a check of each name.
+
+    .. code-block:: python3
+
+        >>> split_endpoint_path("/User/1/relationships/posts")
+        ("relationships", {"type": "User", "id": "1", "relname": "posts"})
+
+    :arg str path:
+    """
+    if not path.startswith("/"):
+        return None
+    # A trailing "/" is optional.
+    if path.endswith("/"):
+        path = path[:-1]
+
+    parts = path[1:].split("/")
+    nparts = len(parts)
+    if not NAME_RE.fullmatch(parts[0]):
+        return None
+    if nparts == 1:
+        return ("collection", {"type": parts[0]})
+    if not ID_RE.fullmatch(parts[1]):
+        return None
+    if nparts == 2:
+        return ("resource", {"type": parts[0], "id": parts[1]})
+    if nparts == 3 and NAME_RE.fullmatch(parts[2]):
+        return (
+            "related", {"type": parts[0], "id": parts[1], "relname": parts[2]}
+        )
+    if nparts == 4 and parts[2] == "relationships"\
+        and NAME_RE.fullmatch(parts[3]):
+        return (
+            "relationships",
+            {"type": parts[0], "id": parts[1], "relname": parts[3]}
+        )
+    return None
+
+
+@functools.lru_cache()
 def build_uris(base_uri):
     """
     Returns a dictionary with the uri re(s) for each endpoint type (collection,
     resource, related and relationships).
 
+    The result is cached, so the regular expressions are compiled only once
+    for each *base_uri*. Don't modify the returned dictionary.
+
     :arg str base_uri:
     """
-    base_url = base_uri.rstrip("/")
-
-    collection = base_url + "/(?P<type>[A-z][A-z0-9]*)"
-    resource = collection + "/(?P<id>[A-z0-9]+)"
-    relationships = resource + "/relationships/(?P<relname>[A-z][A-z0-9]*)"
-    related = resource + "/(?P<relname>[A-z][A-z0-9]*)"
-
-    # Make the rules insensitive against a trailing "/"
-    collection = re.compile(collection + "/?")
-    resource = re.compile(resource + "/?")
-    relationships = re.compile(relationships + "/?")
-    related = re.compile(related + "/?")
-
+    base_url = re.escape(base_uri.rstrip("/"))
     return {
-        "collection": collection, "resource": resource,
-        "relationships": relationships, "related": related
+        "collection": re.compile(base_url + COLLECTION_PATTERN),
+        "resource": re.compile(base_url + RESOURCE_PATTERN),
+        "relationships": re.compile(base_url + RELATIONSHIPS_PATTERN),
+        "related": re.compile(base_url + RELATED_PATTERN)
     }
 
 
@@ -113,6 +208,10 @@ class API(object):
         self._uri = uri.rstrip("/")
         self._parsed_uri = urllib.parse.urlparse(self.uri)
 
+        # All routes combined into one regular expression.
+        # See :meth:`_build_dispatcher`.
+        self._dispatcher = None
+
         # List of tuples: `(uri_regex, handler_type)`
         self._routes = list()
         self._create_routes()
@@ -124,8 +223,14 @@ class API(object):
         # resource class to typename
         self._typenames = dict()
 
+        # subclass of a resource class to the typename of its nearest base
+        # class (see :meth:`get_typename`). The subclasses may be created
+        # dynamically, so we don't keep them alive.
+        self._subclass_typenames = weakref.WeakKeyDictionary()
+
         # typename to ...
         self._schemas = dict()
+        self._type_uris = dict()
         self._resource_classes = dict()
         self._serializers = dict()
         self._unserializers = dict()
@@ -136,14 +241,19 @@ class API(object):
 
         #: The global jsonapi object, which is added to each response.
         #:
-        #: You are free to add meta information in the
-        #: ``jsonapi_object["meta"]`` dictionary.
+        #: The object is shared by all responses and encoded only once. Use
+        #: :meth:`update_jsonapi_meta` to add meta information. Changes,
+        #: which are made directly on this dictionary, are only seen if they
+        #: are done before the first response is created.
         #:
         #: :seealso: http://jsonapi.org/format/#document-jsonapi-object
         self.jsonapi_object = OrderedDict()
         self.jsonapi_object["version"] = version.jsonapi_version
         self.jsonapi_object["meta"] = OrderedDict()
         self.jsonapi_object["meta"]["py-jsonapi-version"] = version.version
+
+        # The pre-encoded :attr:`jsonapi_object`. See :meth:`dump_json`.
+        self._jsonapi_fragment = None
         return None
 
     @property
@@ -169,18 +279,40 @@ class API(object):
         """
         Builds the regular expressions, which match the different endpoint
         types (collection, resource, related, relationships, ...) and adds
-        them to :attr:`_routes`.
+        them with :meth:`_add_route`.
 
         You may **override** this method, if you want to use other handlers
         in your API.
         """
         uris = build_uris(self._uri)
-        self._routes.extend([
-            (uris["collection"], handler.CollectionHandler),
-            (uris["related"], handler.RelatedHandler),
-            (uris["resource"], handler.ResourceHandler),
-            (uris["relationships"], handler.RelationshipHandler)
-        ])
+        self._add_route(uris["collection"], handler.CollectionHandler)
+        self._add_route(uris["related"], handler.RelatedHandler)
+        self._add_route(uris["resource"], handler.ResourceHandler)
+        self._add_route(uris["relationships"], handler.RelationshipHandler)
+        return None
+
+    def _add_route(self, uri_re, handler_type):
+        """
+        Adds a new route to :attr:`_routes`. Requests, whose uri matches the
+        regular expression *uri_re*, are handled by *handler_type*.
+
+        :arg uri_re:
+            A compiled regular expression
+        :arg handler_type:
+            A subclass of :class:`~jsonapi.base.handler.base.BaseHandler`
+        """
+        self._routes.append((uri_re, handler_type))
+        self._invalidate_dispatcher()
+        return None
+
+    def _invalidate_dispatcher(self):
+        """
+        Discards the cached dispatcher (see :meth:`_build_dispatcher`). It is
+        rebuilt on the next request.
+
+        This method must be called, whenever :attr:`_routes` is changed.
+        """
+        self._dispatcher = None
         return None
 
 
@@ -250,7 +382,9 @@ class API(object):
 
     def get_typename(self, o, default=ARG_DEFAULT):
         """
-        Returns the typename of the object *o*.
+        Returns the typename of the object *o*. If the class of *o* has not
+        been added to the API, the typename of its nearest base class is
+        returned.
 
         :arg o:
             A resource class or a resource
@@ -260,13 +394,30 @@ class API(object):
             If the resource type of *o* is not known to the API and no default
             argument is given.
         """
-        typename = self._typenames.get(o) \
-            or self._typenames.get(type(o)) \
-            or default
-
-        if typename is ARG_DEFAULT:
+        # Don't hash the resource itself, only its class.
+        resource_class = o if isinstance(o, type) else type(o)
+
+        typename = self._typenames.get(resource_class)
+        if typename is None:
+            # *o* may be an instance of a subclass, which has not been
+            # added to the API. We use the typename of the nearest base
+            # class and remember it.
+            if resource_class not in self._subclass_typenames:
+                self._subclass_typenames[resource_class] = next(
+                    (
+                        self._typenames[base]\
+                        for base in resource_class.__mro__\
+                        if base in self._typenames
+                    ), None
+                )
+            typename = self._subclass_typenames[resource_class]
+
+        if typename is not None:
+            return typename
+        elif default is ARG_DEFAULT:
             raise KeyError("The type of *o* is not known to the API.")
-        return typename
+        else:
+            return default
 
     def get_typenames(self):
         """
@@ -286,24 +437,97 @@ class API(object):
         return typename in self._schemas
 
 
+    def update_jsonapi_meta(self, key, value):
+        """
+        Sets the meta information *key* in the :attr:`jsonapi_object`, which
+        is added to each response. The cached encoding of the object is
+        discarded, so the change is visible in the next response.
+
+        .. code-block:: python3
+
+            >>> api.update_jsonapi_meta("server", "api-1")
+
+        :arg str key:
+        :arg value:
+        """
+        self.jsonapi_object["meta"][key] = value
+        self._jsonapi_fragment = None
+        return None
+
     def dump_json(self, d):
         """
-        Encodes the object *d* as JSON string.
+        Encodes the object *d* as UTF-8 encoded JSON document.
 
         This method *can be overridden* if you want to use your own json
-        serializer.
+        serializer. The result is written directly into the response body,
+        so overriding methods should return *bytes* too.
 
-        The default implementation uses the :mod:`json` module of the standard
-        library and (if available) the :mod:`bson` json utils.
+        If `orjson <https://github.com/ijl/orjson>`_ is installed, it is used.
+        Otherwise, the :mod:`json` module of the standard library is used.
+        Types which are not supported by the encoder are handled by the
+        :mod:`bson` json utils (if available).
+
+        The :attr:`jsonapi_object` is the same in every response. With
+        orjson 3.9 or newer, it is encoded only once and spliced into the
+        documents as :class:`orjson.Fragment`.
 
         :arg d:
-        :rtype: str
-        """
-        indent = 1 if self.debug else None
-        if bson:
-            return json.dumps(d, default=bson.json_util.default, indent=indent)
+        :rtype: bytes
+        """
+        # *debug* may be a property of the web framework, so we read it
+        # only once.
+        debug = self.debug
+
+        if orjson is not None:
+            if debug:
+                return orjson.dumps(
+                    d, default=_orjson_default, option=ORJSON_DEBUG_OPTION
+                )
+            if orjson_fragment is not None \
+                and isinstance(d, dict) and d.get("jsonapi") is self.jsonapi_object:
+                if self._jsonapi_fragment is None:
+                    self._jsonapi_fragment = orjson_fragment(
+                        orjson.dumps(self.jsonapi_object, option=ORJSON_OPTION)
+                    )
+                d = dict(d)
+                d["jsonapi"] = self._jsonapi_fragment
+            return orjson.dumps(d, default=_orjson_default, option=ORJSON_OPTION)
+
+        if debug:
+            s = json.dumps(d, default=bson_default, indent=1)
         else:
-            return json.dumps(d, indent=indent)
+            s = json.dumps(d, default=bson_default, separators=(",", ":"))
+        return s.encode("utf-8")
+
+    def dump_json_stream(self, d, chunk_size=100):
+        """
+        Encodes the JSONapi document *d* chunk by chunk with :meth:`dump_json`
+        and returns an iterator over the encoded *bytes*. Web frameworks use
+        this method to stream large documents to the client.
+
+        :arg dict d:
+        :arg int chunk_size:
+            The number of resource objects, which are encoded at once.
+
+        :seealso: :func:`jsonapi.base.utilities.iter_document`
+        """
+        return iter_document(d, self.dump_json, chunk_size)
+
+    def write_document(self, response, d):
+        """
+        Encodes the JSONapi document *d* with :meth:`dump_json` and uses it as
+        body of the *response*.
+
+        This method *can be overridden* by web frameworks, which stream large
+        documents to the client. They can set the document with
+        :meth:`jsonapi.base.response.Response.set_document`, so that it is
+        encoded only when needed.
+
+        :arg jsonapi.base.response.Response response:
+        :arg dict d:
+        """
+        response.body = self.dump_json(d)
+        return None
 
     def load_json(self, s):
         """
@@ -315,12 +539,19 @@ class API(object):
         The default implementation uses the :mod:`json` module of the standard
         library and (if available) the :mod:`bson` json utils.
 
+        If `orjson <https://github.com/ijl/orjson>`_ is installed, it is used
+        instead. Documents with a ``$`` character may contain extended JSON
+        (e.g. ``{"$oid": ...}``), so they are still decoded with the :mod:`bson`
+        object hook, if :mod:`bson` is available. Please note, that
+        :mod:`orjson` decodes integers, which do not fit into 64 bits, as
+        *float*.
+
         :arg str s:
         """
-        if bson:
-            return json.loads(s, object_hook=bson.json_util.object_hook)
-        else:
-            return json.loads(s)
+        if orjson is not None \
+            and not (bson_object_hook is not None and "$" in s):
+            return orjson.loads(s)
+        return json.loads(s, object_hook=bson_object_hook)
 
 
     @property
@@ -367,21 +598,19 @@ class API(object):
         :raises ValueError:
             If the typename does not exist.
         """
-        if not typename in self._serializers:
+        type_uri = self._type_uris.get(typename)
+        if type_uri is None:
             raise ValueError("Unknown typename '{}'".format(typename))
 
         if endpoint == "collection":
-            return "{}/{}".format(self._uri, typename)
+            return type_uri
         elif endpoint == "resource":
-            return "{}/{}/{}".format(self._uri, typename, kargs["id"])
+            return type_uri + "/" + str(kargs["id"])
         elif endpoint == "relationship":
-            return "{}/{}/{}/relationships/{}".format(
-                self._uri, typename, kargs["id"], kargs["relname"]
-            )
+            return type_uri + "/" + str(kargs["id"]) + "/relationships/"\
+                + kargs["relname"]
         elif endpoint == "related":
-            return "{}/{}/{}/{}".format(
-                self._uri, typename, kargs["id"], kargs["relname"]
-            )
+            return type_uri + "/" + str(kargs["id"]) + "/" + kargs["relname"]
         else:
             raise ValueError("Unknown endpoint type '{}'".format(endpoint))
 
@@ -396,11 +625,15 @@ class API(object):
         resource_class = schema.resource_class
 
         self._typenames[schema.resource_class] = schema.typename
+        self._subclass_typenames.clear()
         self._schemas[schema.typename] = schema
         self._resource_classes[schema.typename] = resource_class
         self._serializers[schema.typename] = serializer_
         self._unserializers[schema.typename] = unserializer
 
+        # The uri prefix of all endpoints of this type.
+        self._type_uris[schema.typename] = self._uri + "/" + schema.typename
+
         # Add some new keys to the _jsonapi attribute of the resource class.
         resource_class._jsonapi = getattr(resource_class, "_jsonapi", dict())
         resource_class._jsonapi.update({
@@ -410,8 +643,72 @@ class API(object):
             "unserializer": unserializer,
             "api": self
         })
+
+        self._invalidate_dispatcher()
         return None
 
+    def _build_dispatcher(self):
+        """
+        Combines the regular expressions of all :attr:`_routes` into one
+        alternation, so that a request uri is matched with only one call.
+
+        Each route becomes a named group ``r<index>`` and its own named groups
+        are prefixed with ``r<index>_``, because a group name must be unique
+        in a regular expression.
+
+        If all routes start with the API :attr:`uri` (the default), this
+        prefix is removed from the patterns. It is compared with a simple
+        string comparison and only the rest of the path must be matched by
+        the regular expression.
+
+        If the routes are the default endpoints of :func:`build_uris`, the
+        paths are dispatched with :func:`split_endpoint_path` instead of the
+        regex.
+
+        Returns a tuple ``(uri prefix, endpoints, regex, routes)``, where
+        *endpoints* maps the endpoint type to the handler (or is None) and
+        *routes* maps the group name of a route to the handler and a list of
+        ``(group name, argument name)`` tuples.
+        """
+        uri_prefix = self._parsed_uri.path
+        escaped_prefix = re.escape(uri_prefix)
+        if not all(
+            uri_re.pattern.startswith(escaped_prefix)\
+            for uri_re, HandlerType in self._routes
+            ):
+            uri_prefix = escaped_prefix = ""
+
+        # Check if only the default routes are used.
+        endpoints = None
+        if uri_prefix == self._uri:
+            endpoint_types = {
+                uri_re: endpoint_type\
+                for endpoint_type, uri_re in build_uris(self._uri).items()
+            }
+            endpoints = {
+                endpoint_types.get(uri_re): HandlerType\
+                for uri_re, HandlerType in self._routes
+            }
+            if len(self._routes) != len(endpoint_types) \
+                or set(endpoints) != set(endpoint_types.values()):
+                endpoints = None
+
+        patterns = list()
+        routes = dict()
+        for i, (uri_re, HandlerType) in enumerate(self._routes):
+            prefix = "r{}_".format(i)
+            pattern = re.sub(
+                r"\(\?P<(\w+)>", "(?P<" + prefix + r"\1>",
+                uri_re.pattern[len(escaped_prefix):]
+            )
+            patterns.append("(?P<r{}>{})".format(i, pattern))
+            routes["r{}".format(i)] = (
+                HandlerType,
+                [(prefix + name, name) for name in uri_re.groupindex]
+            )
+        regex = re.compile("|".join(patterns))
+        return (uri_prefix, endpoints, regex, routes)
+
     def _find_handler(self, request):
         """
         Parses the :attr:`request.uri` and returns the handler for the requested
@@ -425,12 +722,35 @@ class API(object):
         :raises jsonapi.base.errors.NotFound:
             If the :attr:`request.uri` is not a valid API endpoint.
         """
-        for uri_re, HandlerType in self._routes:
-            match = uri_re.fullmatch(request.parsed_uri.path)
-            if match:
-                request.japi_uri_arguments.update(match.groupdict())
-                return HandlerType
-        raise errors.NotFound()
+        # The dispatcher is built lazily and discarded by
+        # :meth:`_invalidate_dispatcher`, when the routes change.
+        if self._dispatcher is None:
+            self._dispatcher = self._build_dispatcher()
+        uri_prefix, endpoints, regex, routes = self._dispatcher
+
+        # Reject all paths outside of the API, before we run the regex.
+        path = request.parsed_uri.path
+        if not path.startswith(uri_prefix):
+            raise errors.NotFound()
+
+        # Dispatch the default endpoints without the regex.
+        if endpoints is not None:
+            endpoint = split_endpoint_path(path[len(uri_prefix):])
+            if endpoint is None:
+                raise errors.NotFound()
+            endpoint_type, arguments = endpoint
+            request.japi_uri_arguments.update(arguments)
+            return endpoints[endpoint_type]
+
+        match = regex.fullmatch(path, len(uri_prefix))
+        if match is None:
+            raise errors.NotFound()
+
+        HandlerType, arguments = routes[match.lastgroup]
+        request.japi_uri_arguments.update(
+            (name, match.group(group)) for group, name in arguments
+        )
+        return HandlerType
 
     def handle_request(self, request):
         """
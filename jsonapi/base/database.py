@@ -34,9 +34,12 @@ If you want to implement your own database adapter, you must extend
 can take a look at the existing database adapters, if you need an example.
 """
 
+# std
+import itertools
+
 # local
 from . import errors
-from .utilities import relative_identifiers
+from .utilities import walk_include_paths
 
 
 __all__ = [
@@ -98,7 +101,7 @@ class Session(object):
         return None
 
     def query(self, typename,
-        *, sorting=None, limit=None, offset=None, filters=None
+        *, sorting=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         **Must be overridden**
@@ -150,13 +153,23 @@ class Session(object):
 
                 *   :attr:`jsonapi.base.request.Request.japi_filters`
 
+        *   after (str or None)
+
+            If given, only the resources with an id greater than *after* are
+            returned, sorted by their id. This is used for the keyset
+            pagination and is never combined with *sorting* or *offset*.
+
+            .. seealso::
+
+                *   :attr:`jsonapi.base.request.Request.japi_page_after`
+
         :raises errors.UnsortableField:
         :raises errors.UnfilterableField:
         """
         raise NotImplementedError()
 
     def query_size(self, typename,
-        *, sorting=None, limit=None, offset=None, filters=None
+        *, sorting=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         **Must be overridden**
@@ -168,10 +181,14 @@ class Session(object):
 
     def get(self, identifier, required=False):
         """
-        **Must be overridden**
+        **May be overridden**
 
         Returns the resource with the id ``identifier`` or None, if there is
-        no resource with this id.
+        no resource with this id. The default implementation forwards to
+        :meth:`get_many`.
+
+        If you need more than one resource, use :meth:`get_many`, instead
+        of calling this method in a loop.
 
         :arg identifier:
             An identifier tuple: ``(typename, id)``
@@ -181,7 +198,8 @@ class Session(object):
 
         :raises jsonapi.base.errors.ResourceNotFound:
         """
-        raise NotImplementedError()
+        resources = self.get_many([identifier], required=required)
+        return resources.get(identifier)
 
     def get_many(self, identifiers, required=False):
         """
@@ -208,6 +226,33 @@ class Session(object):
         """
         raise NotImplementedError()
 
+    def get_many_iter(self, identifiers, required=False, chunk_size=500):
+        """
+        **May be overridden**
+
+        Works like :meth:`get_many`, but yields the ``(identifier, resource)``
+        pairs instead of returning a dictionary. The resources are loaded in
+        chunks of *chunk_size* identifiers, so that huge identifier sets are
+        never held in memory as a whole.
+
+        :arg identifiers:
+            A list of identifier tuples
+        :arg bool required:
+            If true, throw a ResourceNotFound error if a resource does not
+            exist.
+        :arg int chunk_size:
+            The number of identifiers loaded with one :meth:`get_many` call.
+
+        :raises jsonapi.base.errors.ResourceNotFound:
+        """
+        identifiers = iter(identifiers)
+        while True:
+            chunk = list(itertools.islice(identifiers, chunk_size))
+            if not chunk:
+                break
+            yield from self.get_many(chunk, required=required).items()
+        return None
+
     def save(self, resources):
         """
         **Must be overridden**
@@ -240,6 +285,27 @@ class Session(object):
         """
         raise NotImplementedError()
 
+    def get_with_relatives(self, identifier, paths, required=False):
+        """
+        **May be overridden** for performance reasons.
+
+        Returns the tuple ``(resource, relatives)`` with the resource with
+        the id *identifier* and the resources on the include *paths*. The
+        default implementation calls :meth:`get` and :meth:`get_relatives`,
+        but an adapter may load both with fewer queries.
+
+        :arg tuple identifier:
+        :arg list paths:
+        :arg bool required:
+
+        :raises jsonapi.base.errors.ResourceNotFound:
+        :raises jsonapi.base.errors.UnresolvableIncludePath:
+        """
+        resource = self.get(identifier, required)
+        if resource is None:
+            return (None, dict())
+        return (resource, self.get_relatives([resource], paths))
+
     def get_relatives(self, resources, paths):
         """
         **May be overridden** for performance reasons.
@@ -279,27 +345,16 @@ class Session(object):
             *get_relatives()* is not an expressive name for the functionality
             of this method.
         """
-        all_relatives = dict()
-        root_resources = resources
-
-        for path in paths:
-            resources = root_resources
-            for relname in path:
-                # Collect the ids of all related resources.
-                relids = set()
-                for resource in resources:
-                    try:
-                        tmp = relative_identifiers(relname, resource)
-                    except errors.RelationshipNotFound:
-                        raise errors.UnresolvableIncludePath(path)
-                    else:
-                        relids.update(tmp)
-
-                # Query the relatives from the database.
-                relatives = self.get_many(relids, required=True)
-                all_relatives.update(relatives)
-
-                # The next relationship name in the path is defined on the
-                # previously fetched relatives.
-                resources = relatives.values()
-        return all_relatives
+        # Nothing to include (the common case).
+        if not paths or not resources:
+            return dict()
+
+        # The walk yields the missing identifiers of each level and expects
+        # the loaded resources in return.
+        walk = walk_include_paths(resources, paths)
+        try:
+            missing = next(walk)
+            while True:
+                missing = walk.send(self.get_many(missing, required=True))
+        except StopIteration as err:
+            return err.value
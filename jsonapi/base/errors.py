@@ -34,7 +34,10 @@ http://jsonapi.org/format/#errors
 from collections import OrderedDict
 
 # third party
-from cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:
+    from cached_property import cached_property
 
 
 __all__ = [
@@ -180,8 +183,8 @@ class ErrorList(Exception):
         assert isinstance(error, Error)
         self.errors.append(error)
 
-        # Invalidate the cache.
-        del self.json
+        # Invalidate the cache (if it has been computed).
+        self.__dict__.pop("json", None)
         return None
 
     def extend(self, error):
@@ -190,10 +193,21 @@ class ErrorList(Exception):
         assert isinstance(error, ErrorList)
         self.errors.extend(error.errors)
 
-        # Invalidate the cache.
-        del self.json
+        # Invalidate the cache (if it has been computed).
+        self.__dict__.pop("json", None)
         return None
 
+    @property
+    def http_status(self):
+        """
+        The common http status of all errors. If the errors have different
+        status codes, the most general one (e.g. *400* or *500*) is used.
+        """
+        statuses = set(err.http_status for err in self.errors)
+        if len(statuses) == 1:
+            return statuses.pop()
+        return max(status//100 for status in statuses)*100
+
     @cached_property
     def json(self):
         """
@@ -366,8 +380,8 @@ class UnfilterableField(BadRequest):
         self.filtername = filtername
         self.fieldname = fieldname
 
-        detail = "The filter '{}' is not supported on the '{}' field of '{}.'"\
-            .format(filtername, fieldname)
+        detail = "The filter '{}' is not supported on the '{}' field of '{}'."\
+            .format(filtername, fieldname, typename)
         super().__init__(detail=detail, **kargs)
         return None
 
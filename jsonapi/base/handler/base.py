@@ -41,6 +41,12 @@ class BaseHandler(object):
     :arg jsonapi.base.request.Request request:
     """
 
+    __slots__ = ("api", "request", "response", "db")
+
+    #: The http methods (lower case), which are dispatched to the handler
+    #: method with the same name.
+    METHODS = frozenset(["head", "get", "post", "patch", "delete"])
+
     def __init__(self, api, db, request):
         """
         """
@@ -60,17 +66,9 @@ class BaseHandler(object):
         """
         Handles a requested.
         """
-        if self.request.method == "head":
-            return self.head()
-        elif self.request.method == "get":
-            return self.get()
-        elif self.request.method == "post":
-            return self.post()
-        elif self.request.method == "patch":
-            return self.patch()
-        elif self.request.method == "delete":
-            return self.delete()
-        raise MethodNotAllowed()
+        if not self.request.method in self.METHODS:
+            raise MethodNotAllowed()
+        return getattr(self, self.request.method)()
 
     def head(self):
         """
@@ -27,11 +27,9 @@ jsonapi.base.handler.related
 ============================
 """
 
-# std
-from collections import OrderedDict
-
 # local
 from .. import errors
+from ..request import JSONAPI_MEDIA_TYPE
 from ..serializer import serialize_many
 from .base import BaseHandler
 
@@ -41,6 +39,8 @@ class RelatedHandler(BaseHandler):
     Returns the related resources for the resource.
     """
 
+    __slots__ = ("typename", "relname", "real_typename", "resource_id", "resource")
+
     def __init__(self, api, db, request):
         """
         """
@@ -59,7 +59,7 @@ class RelatedHandler(BaseHandler):
     def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
@@ -90,17 +90,15 @@ class RelatedHandler(BaseHandler):
         included = serialize_many(
             included_resources.values(), fields=self.request.japi_fields
         )
-        meta = OrderedDict()
-        links = OrderedDict()
 
         # Create the response
         self.response.headers["content-type"] = "application/vnd.api+json"
         self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        self.api.write_document(self.response, {
+            "data": data,
+            "included": included,
+            "meta": {},
+            "links": {},
+            "jsonapi": self.api.jsonapi_object
+        })
         return None
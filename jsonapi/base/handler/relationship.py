@@ -27,12 +27,10 @@ jsonapi.base.handler.relationship
 =================================
 """
 
-# std
-from collections import OrderedDict
-
 # local
 from .. import errors
 from .. import validators
+from ..request import JSONAPI_MEDIA_TYPE
 from ..serializer import serialize_many
 from .base import BaseHandler
 
@@ -42,6 +40,11 @@ class RelationshipHandler(BaseHandler):
     Handles the relationship endpoint.
     """
 
+    __slots__ = (
+        "typename", "relname", "real_typename", "resource_id", "resource",
+        "relationship"
+    )
+
     def __init__(self, api, db, request):
         """
         """
@@ -60,7 +63,7 @@ class RelationshipHandler(BaseHandler):
     def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
@@ -89,7 +92,7 @@ class RelationshipHandler(BaseHandler):
             self.resource, self.relname
         )
 
-        links = document.setdefault("links", OrderedDict())
+        links = document.setdefault("links", dict())
         links["self"] = self.api.reverse_url(
             typename=self.typename, endpoint="relationship",
             id=self.resource_id, relname=self.relname
@@ -27,12 +27,10 @@ jsonapi.base.handler.resource
 =============================
 """
 
-# std
-from collections import OrderedDict
-
 # local
 from .. import errors
 from .. import validators
+from ..request import JSONAPI_MEDIA_TYPE
 from ..serializer import serialize_many
 from .base import BaseHandler
 
@@ -42,6 +40,11 @@ class ResourceHandler(BaseHandler):
     Handles a resource endpoint.
     """
 
+    __slots__ = (
+        "typename", "real_typename", "resource_id", "resource",
+        "included_resources"
+    )
+
     def __init__(self, api, db, request):
         """
         """
@@ -56,18 +59,29 @@ class ResourceHandler(BaseHandler):
         # We will load the resource in *prepare()*.
         self.resource_id = self.request.japi_uri_arguments.get("id")
         self.resource = None
+
+        # The included resources of a GET request are loaded together with
+        # the resource in *prepare()*.
+        self.included_resources = None
         return None
 
     def prepare(self):
         """
         """
-        if self.request.content_type[0] != "application/vnd.api+json":
+        if self.request.media_type != JSONAPI_MEDIA_TYPE:
             raise errors.UnsupportedMediaType()
         if not self.api.has_type(self.typename):
             raise errors.NotFound()
 
         # Load the resource
-        self.resource = self.db.get((self.typename, self.resource_id))
+        identifier = (self.typename, self.resource_id)
+        if self.request.method == "get" and self.request.japi_include:
+            self.resource, self.included_resources = \
+                self.db.get_with_relatives(
+                    identifier, self.request.japi_include
+                )
+        else:
+            self.resource = self.db.get(identifier)
         if self.resource is None:
             raise errors.NotFound()
 
@@ -80,34 +94,41 @@ class ResourceHandler(BaseHandler):
 
         http://jsonapi.org/format/#fetching-resources
         """
-        # Fetch the included resources.
-        included_resources = self.db.get_relatives(
-            [self.resource], self.request.japi_include
-        )
+        api = self.api
+        request = self.request
+        response = self.response
+        resource = self.resource
 
         # Build the response document.
-        serializer = self.api.get_serializer(self.real_typename)
+        serializer = api.get_serializer(self.real_typename)
         data = serializer.serialize_resource(
-            self.resource, fields=self.request.japi_fields.get(self.typename)
+            resource, fields=request.japi_fields.get(self.typename)
         )
 
-        included = serialize_many(
-            included_resources.values(), self.request.japi_fields
-        )
-
-        meta = OrderedDict()
-        links = OrderedDict()
+        # Fetch the included resources, if not already done in *prepare()*.
+        # Most requests include nothing, so we skip this step completely.
+        if request.japi_include:
+            included_resources = self.included_resources
+            if included_resources is None:
+                included_resources = self.db.get_relatives(
+                    [resource], request.japi_include
+                )
+            included = serialize_many(
+                included_resources.values(), request.japi_fields
+            )
+        else:
+            included = []
 
         # Put all together
-        self.response.headers["content-type"] = "application/vnd.api+json"
-        self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        response.headers["content-type"] = "application/vnd.api+json"
+        response.status_code = 200
+        api.write_document(response, {
+            "data": data,
+            "included": included,
+            "meta": {},
+            "links": {},
+            "jsonapi": api.jsonapi_object
+        })
         return None
 
     def patch(self):
@@ -116,37 +137,38 @@ class ResourceHandler(BaseHandler):
 
         http://jsonapi.org/format/#crud-updating
         """
-        data = self.request.json.get("data", dict())
+        api = self.api
+        request = self.request
+        response = self.response
+        resource = self.resource
+
+        data = request.json.get("data", dict())
         validators.assert_resource_object(data, source_pointer="/data/")
 
         # Get the unserializer
-        unserializer = self.api.get_unserializer(self.real_typename)
-        unserializer.update_resource(self.db, self.resource, data)
+        unserializer = api.get_unserializer(self.real_typename)
+        unserializer.update_resource(self.db, resource, data)
 
         # Save the resource
-        self.db.save([self.resource])
+        self.db.save([resource])
         self.db.commit()
 
         # Create the response
-        serializer = self.api.get_serializer(self.real_typename)
+        serializer = api.get_serializer(self.real_typename)
         data = serializer.serialize_resource(
-            self.resource, fields=self.request.japi_fields.get(self.typename)
+            resource, fields=request.japi_fields.get(self.typename)
         )
 
-        included = list()
-        meta = OrderedDict()
-        links = OrderedDict()
-
         # Put all together.
-        self.response.headers["content-type"] = "application/vnd.api+json"
-        self.response.status_code = 200
-        self.response.body = self.api.dump_json(OrderedDict([
-            ("data", data),
-            ("included", included),
-            ("meta", meta),
-            ("links", links),
-            ("jsonapi", self.api.jsonapi_object)
-        ]))
+        response.headers["content-type"] = "application/vnd.api+json"
+        response.status_code = 200
+        response.body = api.dump_json({
+            "data": data,
+            "included": [],
+            "meta": {},
+            "links": {},
+            "jsonapi": api.jsonapi_object
+        })
         return None
 
     def delete(self):
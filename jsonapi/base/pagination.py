@@ -33,10 +33,13 @@ http://jsonapi.org/format/#fetching-pagination
 # std
 from collections import OrderedDict
 import math
-import urllib
+import urllib.parse
 
 # third party
-from cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:
+    from cached_property import cached_property
 
 
 class Pagination(object):
@@ -126,3 +129,86 @@ class Pagination(object):
         if self.has_next:
             d["next"] = self.link_next
         return d
+
+
+class KeysetPagination(object):
+    """
+    A helper class for the keyset pagination with ``page[after]``.
+
+    The *next* link points to the page after the last resource on the current
+    page. It is only included, if the current page is full, because
+    otherwise there are no more resources.
+
+    :arg jsonapi.base.request.Request request:
+        The current jsonapi request
+    :arg str last_id:
+        The id of the last resource on the current page or None, if the page
+        is empty.
+    :arg int page_resources:
+        The number of resources on the current page.
+
+    .. seealso::
+
+        *   :attr:`jsonapi.base.request.Request.japi_page_after`
+        *   :attr:`jsonapi.base.request.Request.japi_page_size`
+        *   http://jsonapi.org/format/#fetching-pagination
+    """
+
+    def __init__(self, request, last_id, page_resources):
+        """
+        """
+        assert request.japi_page_after is not None
+
+        self.request = request
+        self.after = self.request.japi_page_after
+        self.page_size = self.request.japi_page_size
+
+        self.link_self = self._page_link(self.after)
+
+        self.has_next = last_id is not None \
+            and self.page_size is not None \
+            and page_resources >= self.page_size
+        self.link_next = self._page_link(last_id) if self.has_next else None
+        return None
+
+    def _page_link(self, after):
+        parsed_uri = self.request.parsed_uri
+
+        # Keep the other query parameters (e.g. the filters), because they
+        # define the keyset.
+        query = [
+            (key, value) for key, values in self.request.query.items()\
+            if not key.startswith("page[") for value in values
+        ]
+        query.append(("page[after]", after))
+        if self.page_size is not None:
+            query.append(("page[size]", self.page_size))
+
+        uri = "{scheme}://{netloc}{path}?{query}".format(
+            scheme=parsed_uri.scheme,
+            netloc=parsed_uri.netloc,
+            path=parsed_uri.path,
+            query=urllib.parse.urlencode(query)
+        )
+        return uri
+
+    @cached_property
+    def json_meta(self):
+        """
+        Must be included in the top-level meta object.
+        """
+        d = OrderedDict()
+        d["page-after"] = self.after
+        d["page-size"] = self.page_size
+        return d
+
+    @cached_property
+    def json_links(self):
+        """
+        Must be included in the top-level links object.
+        """
+        d = OrderedDict()
+        d["self"] = self.link_self
+        if self.has_next:
+            d["next"] = self.link_next
+        return d
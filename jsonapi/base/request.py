@@ -30,10 +30,14 @@ jsonapi.base.request
 # std
 import logging
 import re
+import sys
 import urllib.parse
 
 # third party
-from cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:
+    from cached_property import cached_property
 
 # local
 from . import errors
@@ -47,6 +51,24 @@ __all__ = [
 ]
 
 
+#: Matches the query key of a filter, e.g. ``filter[name]``.
+FILTER_KEY_RE = re.compile(r"filter\[([A-Za-z0-9_]+)\]")
+
+#: Matches the value of a filter. The first group captures the filter name, the
+#: second the (JSON encoded) value.
+FILTER_VALUE_RE = re.compile(
+    r"(eq|ne|lt|lte|gt|gte|in|nin|all|size|exists|iexact|contains|icontains"\
+    r"|startswith|istartswith|endswith|iendswith|match):(.*)",
+    re.DOTALL
+)
+
+#: Matches the query key of a sparse fieldset, e.g. ``fields[User]``.
+FIELDS_KEY_RE = re.compile(r"fields\[([A-Za-z0-9_]+)\]")
+
+#: The JSONapi media type. It is interned like :attr:`Request.media_type`.
+JSONAPI_MEDIA_TYPE = sys.intern("application/vnd.api+json")
+
+
 class Request(object):
     """
     Wraps a request object, which can be used to call the View class.
@@ -63,7 +85,9 @@ class Request(object):
     def __init__(self, uri, method, headers, body, api=None):
         self.api = api
         self.uri = uri
-        self.method = method.lower()
+        # The method is interned, so that the handler's method lookup
+        # compares it by identity.
+        self.method = sys.intern(method.lower())
         self.headers = {key.lower(): value for key, value in headers.items()}
         self.body = body
 
@@ -101,6 +125,23 @@ class Request(object):
         value = self.query.get(name)
         return value[0] if value else fallback
 
+    @cached_property
+    def media_type(self):
+        """
+        The (lower case) media type in the *Content-Type* header, without
+        the parameters. Unlike :attr:`content_type`, the parameters are not
+        parsed.
+
+        .. code-block:: python3
+
+            # Content-Type: application/vnd.api+json; ext="bulk"
+            request.media_type
+            "application/vnd.api+json"
+        """
+        content_type = self.headers.get("content-type", "")
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        return sys.intern(media_type)
+
     @cached_property
     def content_type(self):
         """
@@ -122,8 +163,27 @@ class Request(object):
                 detail="Invalid 'Content-Type' parameter '{}'."\
                     .format(parameter)
                 raise errors.BadRequest(detail=detail)
-            parameters[i] = parameter
-        return (type_, dict(parameters))
+            parameters[i] = (
+                parameter[0].strip().lower(), parameter[1].strip().strip('"')
+            )
+        return (type_.strip(), dict(parameters))
+
+    @cached_property
+    def japi_extensions(self):
+        """
+        Returns the set of the JSONapi extensions, which are requested with
+        the *ext* media type parameter.
+
+        .. code-block:: python3
+
+            # Content-Type: application/vnd.api+json; ext="bulk"
+            request.japi_extensions
+            {"bulk"}
+
+        :seealso: http://jsonapi.org/extensions/
+        """
+        ext = self.content_type[1].get("ext", "")
+        return {name.strip() for name in ext.split(",") if name.strip()}
 
     @cached_property
     def japi_page_number(self):
@@ -209,6 +269,41 @@ class Request(object):
         else:
             return None
 
+    @cached_property
+    def japi_page_after(self):
+        """
+        Returns the id of the resource, after which the requested page starts
+        or None.
+
+        Query parameter: ``page[after]``
+
+        This is the *keyset* (cursor) pagination. The resources are sorted by
+        their id and only the resources with an id greater than
+        ``page[after]`` are returned. Unlike ``page[number]``, the database
+        does not need to skip all resources on the previous pages, so the
+        cost of a request does not grow with the page number.
+
+        :raises jsonapi.base.errors.BadRequest:
+            If ``page[after]`` is combined with ``page[number]`` or ``sort``.
+
+        :seealso: http://jsonapi.org/format/#fetching-pagination
+        """
+        tmp = self.get_query_argument("page[after]")
+
+        if tmp is not None:
+            if self.japi_page_number is not None:
+                raise errors.BadRequest(
+                    detail="'page[after]' can not be combined with "\
+                        "'page[number]'.",
+                    source_parameter="page[after]"
+                )
+            if self.japi_sort:
+                raise errors.BadRequest(
+                    detail="'page[after]' can not be combined with 'sort'.",
+                    source_parameter="page[after]"
+                )
+        return tmp
+
     @cached_property
     def japi_paginate(self):
         """
@@ -216,6 +311,12 @@ class Request(object):
         This is the case, if ``page[size]`` and ``page[number]`` are both
         present and valid.
 
+        .. hint::
+
+            The database must skip all resources on the previous pages, so
+            the cost of a request grows with the page number. Use
+            :attr:`japi_page_after` for deep pagination.
+
         .. seealso::
 
             *   :attr:`japi_page_size`
@@ -345,35 +446,25 @@ class Request(object):
         """
         filters = list()
 
-        KEY_RE = re.compile(r"filter\[([A-z0-9_]+)\]")
-
-        # The first group captures the filters, the second captures the value.
-        VALUE_RE = re.compile(
-            r"(eq:|ne:|lt:|lte:|gt:|gte:|in:|nin:|all:|exists:|iexact:"\
-            r"|contains:|icontains:|startswith:|istartswith:|endswith:"\
-            r"|iendswith:)(.*)"
-        )
-
         for key, values in self.query.items():
-            key_match = re.fullmatch(KEY_RE, key)
-            value_match = re.fullmatch(VALUE_RE, values[0])
+            key_match = FILTER_KEY_RE.fullmatch(key)
+            if not key_match:
+                continue
+
+            value_match = FILTER_VALUE_RE.fullmatch(values[0])
 
             # If the key indicates a filter, but the filtername does not exist,
             # throw a BadRequest exception.
-            if key_match and not value_match:
-                filtername = value_match.group(1)
-                filtername = filtername[:-1]
+            if not value_match:
+                filtername = values[0].split(":", 1)[0]
                 raise errors.BadRequest(
                     detail="The filter '{}' does not exist.".format(filtername),
                     source_parameter=key
                 )
             # The key indicates a filter and the filternames exists.
-            elif key_match and value_match:
+            else:
                 field = key_match.group(1)
-
-                # Remove the tailing ":" from the filter.
                 filtername = value_match.group(1)
-                filtername = filtername[:-1]
 
                 # The value may be encoded as json.
                 value = value_match.group(2)
@@ -407,10 +498,8 @@ class Request(object):
         """
         fields = dict()
 
-        FIELDS_RE = re.compile(r"fields\[([A-z0-9_]+)\]")
-
         for key, value in self.query.items():
-            match = re.fullmatch(FIELDS_RE, key)
+            match = FIELDS_KEY_RE.fullmatch(key)
             if match:
                 typename = match.group(1)
                 type_fields = value[0].split(",")
@@ -516,6 +605,7 @@ class Request(object):
         print("\t", "query", self.query)
         print("\t", "japi_page_number", self.japi_page_number)
         print("\t", "japi_page_size", self.japi_page_size)
+        print("\t", "japi_page_after", self.japi_page_after)
         print("\t", "japi_paginate", self.japi_paginate)
         print("\t", "japi_offset", self.japi_offset)
         print("\t", "japi_limit", self.japi_limit)
@@ -49,16 +49,67 @@ class Response(object):
     def __init__(self, status=200, headers=None, body=None, file=None):
         self.status = status
         self.headers = headers if headers is not None else dict()
-        self.body = body
         self.file = file
+
+        self._body = body
+
+        # The JSON document, which has not been encoded yet and the function,
+        # which encodes it. See :meth:`set_document`.
+        self._document = None
+        self._dumps = None
         return None
 
+    @property
+    def body(self):
+        """
+        The body of the http response as *bytes* or None. If the body has
+        been given as JSON document (:meth:`set_document`), it is encoded on
+        first access.
+        """
+        if self._document is not None:
+            self._body = self._dumps(self._document)
+            self._document = None
+            self._dumps = None
+        return self._body
+
+    @body.setter
+    def body(self, body):
+        self._body = body
+        self._document = None
+        self._dumps = None
+        return None
+
+    def set_document(self, document, dumps):
+        """
+        Sets the JSON *document* as body. The document is encoded with
+        *dumps* only, when :attr:`body` is accessed. This allows web
+        frameworks to stream large documents to the client instead (see
+        :attr:`pending_document`).
+
+        :arg dict document:
+        :arg dumps:
+            A function, which encodes the document to *bytes*
+            (e.g. :meth:`jsonapi.base.api.API.dump_json`).
+        """
+        self._body = None
+        self._document = document
+        self._dumps = dumps
+        return None
+
+    @property
+    def pending_document(self):
+        """
+        The JSON document given to :meth:`set_document`, if it has not been
+        encoded yet, otherwise None.
+        """
+        return self._document
+
     @property
     def has_body(self):
         """
         Returns true, if the response contains a body (and not a file).
         """
-        return self.body is not None
+        return self._body is not None or self._document is not None
 
     @property
     def is_file(self):
@@ -32,7 +32,9 @@ A JSONapi serializer and unserializer based on the
 
 # std
 from collections import OrderedDict
+import functools
 import logging
+from types import MappingProxyType
 
 # local
 from . import errors
@@ -48,6 +50,14 @@ __all__ = [
 LOG = logging.getLogger(__file__)
 
 
+#: A read-only empty object. It is used as default for missing members of
+#: a resource object, so that no empty dictionary is created per call.
+EMPTY_OBJECT = MappingProxyType(dict())
+
+#: Returned by ``dict.get()`` for a missing member, which may also be *null*.
+MISSING = object()
+
+
 class Unserializer(object):
     """
     Takes JSONapi documents and updates a resource.
@@ -56,6 +66,8 @@ class Unserializer(object):
         The schema used to update resources
     """
 
+    __slots__ = ("schema",)
+
     def __init__(self, schema):
         self.schema = schema
         return None
@@ -76,47 +88,65 @@ class Unserializer(object):
 
         :seealso: http://jsonapi.org/format/#document-resource-object-relationships
         """
-        # Collect the identifiers.
+        identifiers, relationships = self._parse_relationships_object(
+            relationships_object
+        )
+        relatives = db.get_many(identifiers, required=True)
+        return self._map_relatives(relationships, relatives)
+
+    def _parse_relationships_object(self, relationships_object):
+        """
+        Extracts the identifiers from the JSONapi relationships object
+        *relationships_object* in one pass. Returns a tuple
+        ``(identifiers, relationships)``, where *identifiers* is the set of
+        all identifiers and *relationships* maps each relationship name (with
+        a *data* key) to None, an identifier or a list of identifiers.
+
+        :arg dict relationships_object:
+        """
         identifiers = set()
+        relationships = dict()
         for relname, relobj in relationships_object.items():
-            reldata = relobj.get("data")
+            reldata = relobj.get("data", MISSING)
+            if reldata is MISSING:
+                continue
 
-            # *to-one* relationship (with target)
-            # -> a single resource identifier object
-            if isinstance(reldata, dict):
-                identifiers.add((reldata["type"], reldata["id"]))
+            # *to-one* relationship with no target
+            if reldata is None:
+                relationships[relname] = None
 
             # *to-many* relationship
             # -> a list of resource identifier objects
-            elif isinstance(reldata, list):
-                identifiers.update(
-                    (item["type"], item["id"]) for item in reldata
-                )
+            elif type(reldata) is list:
+                relids = [(item["type"], item["id"]) for item in reldata]
+                relationships[relname] = relids
+                identifiers.update(relids)
 
-        # Load the resources
-        relatives = db.get_many(identifiers, required=True)
+            # *to-one* relationship (with target)
+            # -> a single resource identifier object
+            else:
+                relid = (reldata["type"], reldata["id"])
+                relationships[relname] = relid
+                identifiers.add(relid)
+        return (identifiers, relationships)
 
-        # Map the relationship names back to the related resources.
+    def _map_relatives(self, relationships, relatives):
+        """
+        Replaces the identifiers in *relationships* (see
+        :meth:`_parse_relationships_object`) with the related resources.
+
+        :arg dict relationships:
+        :arg dict relatives:
+            Maps the identifiers to the loaded relatives.
+        """
         result = dict()
-        for relname, relobj in relationships_object.items():
-            if "data" in relobj:
-                reldata = relobj["data"]
-
-                # *to-one* relationship with no target
-                if reldata is None:
-                    result[relname] = None
-                # *to-one* relationship with target
-                elif isinstance(reldata, dict):
-                    identifier = (reldata["type"], reldata["id"])
-                    result[relname] = relatives[identifier]
-                # *to-many* relationship
-                elif isinstance(reldata, list):
-                    identifiers = [
-                        (item["type"], item["id"]) for item in reldata
-                    ]
-                    result[relname] = [
-                        relatives[identifier] for identifier in identifiers
-                    ]
+        for relname, relids in relationships.items():
+            if relids is None:
+                result[relname] = None
+            elif type(relids) is list:
+                result[relname] = [relatives[relid] for relid in relids]
+            else:
+                result[relname] = relatives[relids]
         return result
 
     def create_resource(self, db, resource_object):
@@ -135,11 +165,11 @@ class Unserializer(object):
         assert resource_object["type"] == self.schema.typename
 
         # Load all relatives
-        relationships = resource_object.get("relationships", dict())
+        relationships = resource_object.get("relationships", EMPTY_OBJECT)
         relationships = self._load_relationships_object(db, relationships)
 
         # Get the attributes
-        attributes = resource_object.get("attributes", dict())
+        attributes = resource_object.get("attributes", EMPTY_OBJECT)
 
         # Create the new resource.
         fields = dict()
@@ -179,16 +209,28 @@ class Unserializer(object):
             except errors.ErrorList as err:
                 error_list.extend(err)
 
-        # Update the relationships
+        # Update the relationships. The relatives of all relationships are
+        # loaded at once.
         if "relationships" in resource_object:
-            rels_object = resource_object["relationships"]
-            for rel_name, rel_object in rels_object.items():
-                try:
-                    self.update_relationship(db, resource, rel_name, rel_object)
-                except errors.Error as err:
-                    error_list.append(err)
-                except errors.ErrorList as err:
-                    error_list.extend(err)
+            identifiers, relationships = self._parse_relationships_object(
+                resource_object["relationships"]
+            )
+            try:
+                relatives = db.get_many(identifiers, required=True)
+            except errors.Error as err:
+                error_list.append(err)
+            except errors.ErrorList as err:
+                error_list.extend(err)
+            else:
+                schema_relationships = self.schema.relationships
+                relationships = self._map_relatives(relationships, relatives)
+                for rel_name, relatives in relationships.items():
+                    try:
+                        schema_relationships[rel_name].set(resource, relatives)
+                    except errors.Error as err:
+                        error_list.append(err)
+                    except errors.ErrorList as err:
+                        error_list.extend(err)
 
         if error_list:
             raise error_list
@@ -245,30 +287,11 @@ class Unserializer(object):
         :seealso: http://jsonapi.org/format/#crud-updating-relationships
         """
         relationship = self.schema.relationships[relationship_name]
-
-        # Break if no data key is given.
-        if not "data" in relationship_object:
-            return None
-
-        # Update a *to-one* relationship
-        if relationship.to_one:
-            identifier = relationship_object["data"]
-            if identifier is None:
-                relative = None
-            else:
-                identifier = (identifier["type"], identifier["id"])
-                relative = db.get(identifier, required=True)
-            relationship.set(resource, relative)
-
-        # Update a *to-many* relationship
-        else:
-            identifiers = relationship_object["data"]
-            identifiers = [(item["type"], item["id"]) for item in identifiers]
-
-            relatives = db.get_many(identifiers, required=True)
-            relatives = list(relatives.values())
-
-            relationship.set(resource, relatives)
+        relatives = self._load_relationships_object(
+            db, {relationship_name: relationship_object}
+        )
+        if relationship_name in relatives:
+            relationship.set(resource, relatives[relationship_name])
         return None
 
     def extend_relationship(
@@ -295,14 +318,15 @@ class Unserializer(object):
         relationship = self.schema.relationships[relationship_name]
         assert relationship.to_many
 
-        if "data" in relationship_object:
+        identifiers = relationship_object.get("data", MISSING)
+        if identifiers is not MISSING:
             # Get the identifier tuples of the new relatives.
-            identifiers = relationship_object["data"]
             identifiers = [(item["type"], item["id"]) for item in identifiers]
 
-            # Load the new relatives.
+            # Load the new relatives. They are added in the order of the
+            # request document, not in the order of *get_many()*.
             relatives = db.get_many(identifiers, required=True)
-            relatives = list(relatives.values())
+            relatives = [relatives[identifier] for identifier in identifiers]
 
             relationship.extend(resource, relatives)
         return None
@@ -332,12 +356,94 @@ class Serializer(object):
         The schema used to serialize resources
     """
 
+    #: If a subclass overrides one of these methods, the resources are
+    #: serialized with them and not with the compiled serializers
+    #: (see :meth:`_compile`).
+    SERIALIZE_METHODS = (
+        "serialize_resource", "serialize_identifier", "serialize_attributes",
+        "serialize_relationships", "serialize_relationship"
+    )
+
     def __init__(self, schema):
         """
         """
         self.schema = schema
+
+        # The schema does not change, so we look up the typename and sort the
+        # fields only once and save the getters of the attributes.
+        self._typename = schema.typename
+        self._attribute_getters = tuple(
+            (name, schema.attributes[name].get)\
+            for name in sorted(schema.attributes)
+        )
+        self._relationship_names = tuple(sorted(schema.relationships))
+        self._relationships = tuple(
+            (name, schema.relationships[name])\
+            for name in self._relationship_names
+        )
+
+        # The compiled serializers for the sparse fieldsets, which have been
+        # requested recently.
+        self._get_compiled = functools.lru_cache(maxsize=256)(self._compile)
+
+        # The compiled serializers bypass the *serialize_...()* methods, so
+        # they are only used, if a subclass does not override one of them.
+        self._use_compiled = all(
+            getattr(type(self), name) is getattr(Serializer, name)\
+            for name in self.SERIALIZE_METHODS
+        )
         return None
 
+    def _compile(self, fields):
+        """
+        Generates the source of a function, which serializes a list of
+        resources with only the fields in *fields*, and compiles it. The
+        function reads each attribute and relationship in straight-line code,
+        so that we do not loop over the schema for every resource.
+
+        :arg frozenset fields:
+            The requested fields or None, if all fields are requested.
+        """
+        namespace = {
+            "typename": self._typename,
+            "get_id": self.schema.id_attribute.get,
+            "serialize_relationship": self._serialize_relationship
+        }
+
+        attributes = list()
+        for i, (name, getter) in enumerate(self._attribute_getters):
+            if fields is None or name in fields:
+                namespace["get_attribute_%d" % i] = getter
+                attributes.append(
+                    "%r: get_attribute_%d(resource)" % (name, i)
+                )
+
+        relationships = list()
+        for i, (name, rel) in enumerate(self._relationships):
+            if fields is None or name in fields:
+                namespace["relationship_%d" % i] = rel
+                relationships.append(
+                    "%r: serialize_relationship(resource, relationship_%d)"\
+                    % (name, i)
+                )
+
+        members = ["\"type\": typename", "\"id\": get_id(resource)"]
+        if attributes:
+            members.append("\"attributes\": {%s}" % ", ".join(attributes))
+        if relationships:
+            members.append(
+                "\"relationships\": {%s}" % ", ".join(relationships)
+            )
+
+        source = (
+            "def serialize(resources):\n"
+            "    return [{%s} for resource in resources]\n"
+        ) % ", ".join(members)
+
+        filename = "<jsonapi serializer %s>" % self._typename
+        exec(compile(source, filename, "exec"), namespace)
+        return namespace["serialize"]
+
     def serialize_resource(self, resource, fields=None):
         """
         Creates the JSONapi resource object.
@@ -348,6 +454,9 @@ class Serializer(object):
 
         :seealso: http://jsonapi.org/format/#document-resource-objects
         """
+        if self._use_compiled:
+            return self.serialize_resources([resource], fields)[0]
+
         d = OrderedDict()
         d.update(self.serialize_identifier(resource))
 
@@ -360,6 +469,30 @@ class Serializer(object):
             d["relationships"] = relationships
         return d
 
+    def serialize_resources(self, resources, fields=None):
+        """
+        Creates the JSONapi resource objects for all *resources*. The fields,
+        which should be included, are selected only once for all resources,
+        so this is faster than calling :meth:`serialize_resource` for each
+        resource.
+
+        :arg list resources:
+        :arg list fields:
+            A list with the names of the fields, which should be included.
+
+        :seealso: http://jsonapi.org/format/#document-resource-objects
+        """
+        if not self._use_compiled:
+            return [
+                self.serialize_resource(resource, fields)\
+                for resource in resources
+            ]
+
+        serialize = self._get_compiled(
+            None if fields is None else frozenset(fields)
+        )
+        return serialize(resources)
+
     def serialize_identifier(self, resource):
         """
         Creates the JSONapi resource identifier object.
@@ -368,10 +501,10 @@ class Serializer(object):
 
         :seealso: http://jsonapi.org/format/#document-resource-identifier-objects
         """
-        d = OrderedDict()
-        d["type"] = self.schema.typename
-        d["id"] = self.schema.id_attribute.get(resource)
-        return d
+        return {
+            "type": self._typename,
+            "id": self.schema.id_attribute.get(resource)
+        }
 
     def serialize_attributes(self, resource, fields=None):
         """
@@ -384,10 +517,9 @@ class Serializer(object):
         :seealso: http://jsonapi.org/format/#document-resource-object-attributes
         """
         d = OrderedDict()
-        for name in sorted(self.schema.attributes):
+        for name, getter in self._attribute_getters:
             if fields is None or name in fields:
-                attr = self.schema.attributes[name]
-                d[name] = attr.get(resource)
+                d[name] = getter(resource)
         return d
 
     def serialize_relationships(self, resource, fields):
@@ -401,7 +533,7 @@ class Serializer(object):
         :seealso: http://jsonapi.org/format/#document-resource-object-relationships
         """
         d = OrderedDict()
-        for name in sorted(self.schema.relationships):
+        for name in self._relationship_names:
             if fields is None or name in fields:
                 d[name] = self.serialize_relationship(resource, name)
         return d
@@ -417,24 +549,27 @@ class Serializer(object):
         :seealso: http://jsonapi.org/format/#document-resource-object-relationships
         """
         rel = self.schema.relationships[name]
-        d = OrderedDict()
+        return self._serialize_relationship(resource, rel)
+
+    def _serialize_relationship(self, resource, rel):
+        """
+        Creates the JSONapi relationship object for the relationship *rel*.
 
+        :arg resource:
+        :arg jsonapi.base.schema.BaseRelationship rel:
+        """
         # Serialize a to-one relationship.
         if rel.to_one:
             relative = rel.get(resource)
             if relative is None:
-                d["data"] = None
-            else:
-                d["data"] = ensure_identifier_object(relative)
+                return {"data": None}
+            return {"data": ensure_identifier_object(relative)}
 
         # Serialize a to many relationship.
-        else:
-            relatives = rel.get(resource)
-            relatives = [
-                ensure_identifier_object(item) for item in relatives
-            ]
-            d["data"] = relatives
-        return d
+        relatives = rel.get(resource)
+        return {
+            "data": [ensure_identifier_object(item) for item in relatives]
+        }
 
 
 def serialize_many(resources, fields):
@@ -450,11 +585,20 @@ def serialize_many(resources, fields):
     :seealso: :meth:`Serializer.serialize_resource`
     :seealso: :meth:`jsonapi.base.request.Request.japi_fields`
     """
-    data = list()
-    for resource in resources:
-        serializer = resource._jsonapi["serializer"]
-        typename = resource._jsonapi["typename"]
-        data.append(
-            serializer.serialize_resource(resource, fields=fields.get(typename))
+    resources = list(resources)
+
+    # Group the resources by their type, so that each serializer can
+    # serialize all of its resources with one call.
+    groups = OrderedDict()
+    for i, resource in enumerate(resources):
+        groups.setdefault(resource._jsonapi["typename"], list()).append(i)
+
+    data = [None]*len(resources)
+    for typename, indices in groups.items():
+        serializer = resources[indices[0]]._jsonapi["serializer"]
+        serialized = serializer.serialize_resources(
+            [resources[i] for i in indices], fields=fields.get(typename)
         )
+        for i, d in zip(indices, serialized):
+            data[i] = d
     return data
@@ -30,9 +30,6 @@ This module contains some helpers, which are frequently needed in different
 modules.
 """
 
-# std
-from collections import OrderedDict
-
 # local
 from . import errors
 
@@ -42,6 +39,10 @@ __all__ = [
     "ensure_identifier",
     "collect_identifiers",
     "relative_identifiers",
+    "relatives_identifiers",
+    "walk_include_paths",
+    "document_size",
+    "iter_document"
 ]
 
 
@@ -64,28 +65,19 @@ def ensure_identifier_object(obj):
     """
     # Identifier tuple
     if isinstance(obj, tuple):
-        d = OrderedDict([
-            ("type", obj[0]),
-            ("id", obj[1])
-        ])
-        return d
+        return {"type": obj[0], "id": obj[1]}
     # JSONapi identifier object
     elif isinstance(obj, dict):
         # The dictionary may contain more keys than only *id* and *type*. So
         # we extract only these two keys.
-        d = OrderedDict([
-            ("type", obj["type"]),
-            ("id", obj["id"])
-        ])
-        return d
+        return {"type": obj["type"], "id": obj["id"]}
     # obj is a resource resource
     else:
         schema = obj._jsonapi["schema"]
-        d = OrderedDict([
-            ("typename", schema.typename),
-            ("id", schema.id_attribute.get(obj))
-        ])
-        return d
+        return {
+            "type": schema.typename,
+            "id": schema.id_attribute.get(obj)
+        }
 
 
 def ensure_identifier(obj):
@@ -174,9 +166,187 @@ def relative_identifiers(relname, resource):
         raise errors.RelationshipNotFound(schema.typename, relname)
     elif relationship.to_one:
         relative = relationship.get(resource)
-        relatives = [relative] if relative else []
-    else:
-        relatives = relationship.get(resource)
+        return [ensure_identifier(relative)] if relative else []
+
+    return _to_many_identifiers(relationship.get(resource), dict())
+
+
+def relatives_identifiers(relname, resources):
+    """
+    Returns a set with the ids of all resources, which are related to at
+    least one of the *resources*. Unlike :func:`relative_identifiers`, the
+    relationship is looked up only once per resource class and not for each
+    resource.
+
+    :arg str relname:
+        The name of the relationship
+    :arg resources:
+
+    :raises jsonapi.base.errors.RelationshipNotFound:
+    """
+    by_class = dict()
+    for resource in resources:
+        by_class.setdefault(type(resource), []).append(resource)
+
+    identifiers = set()
+    schemas = dict()
+    for resources in by_class.values():
+        schema = resources[0]._jsonapi["schema"]
+        relationship = schema.relationships.get(relname)
+        if relationship is None:
+            raise errors.RelationshipNotFound(schema.typename, relname)
+
+        relationship_get = relationship.get
+        if relationship.to_one:
+            # The to-one relatives share the schema cache with the to-many
+            # relationships.
+            relatives = [relationship_get(resource) for resource in resources]
+            identifiers.update(_to_many_identifiers(
+                [relative for relative in relatives if relative], schemas
+            ))
+        else:
+            for resource in resources:
+                identifiers.update(
+                    _to_many_identifiers(relationship_get(resource), schemas)
+                )
+    return identifiers
+
+
+def _to_many_identifiers(relatives, schemas):
+    """
+    Returns a list with the ids of the *relatives* in a to-many relationship,
+    or of the to-one relatives of many resources.
+
+    :arg relatives:
+    :arg dict schemas:
+        Maps the classes of the relatives to their schemas. Missing schemas
+        are added.
+    """
+    # The relatives in a to-many relationship are usually resource objects
+    # of the same type. We look up their schema only once per class.
+    identifiers = list()
+    for relative in relatives:
+        relative_class = type(relative)
+        if relative_class in schemas:
+            schema = schemas[relative_class]
+        elif isinstance(relative, (tuple, dict)):
+            identifiers.append(ensure_identifier(relative))
+            continue
+        else:
+            schema = relative._jsonapi["schema"]
+            schemas[relative_class] = schema
+        identifiers.append((schema.typename, schema.id_attribute.get(relative)))
+    return identifiers
+
 
-    relatives = [ensure_identifier(relative) for relative in relatives]
-    return relatives
+def walk_include_paths(resources, paths):
+    """
+    Walks along the include *paths*, starting at the *resources*. The paths
+    are walked simultaneously, level by level. This generator yields for each
+    level the set of identifiers, which have not been loaded yet, and expects
+    a dictionary with the loaded resources in return (:meth:`send`).
+    When all paths have been walked, the dictionary with all relatives is
+    returned (*StopIteration.value*).
+
+    This function implements the traversal of
+    :meth:`jsonapi.base.database.Session.get_relatives` for the synchronous
+    and asynchronous database sessions.
+
+    :arg resources:
+        The root resources
+    :arg list paths:
+        A list of include paths (lists of relationship names)
+
+    :raises jsonapi.base.errors.UnresolvableIncludePath:
+    """
+    # Merge the paths into a tree, so that paths with the same prefix
+    # (e.g. ["author"] and ["author", "posts"]) are walked together.
+    # Each node maps the relationship name to the path, used in error
+    # messages, and the child nodes.
+    tree = dict()
+    for path in paths:
+        node = tree
+        for relname in path:
+            node = node.setdefault(relname, (path, dict()))[1]
+
+    # We walk all paths simultaneously, level by level, so that we need
+    # only one *get_many()* call per level.
+    all_relatives = dict()
+    frontier = [(tree, resources)]
+    while frontier:
+        # Collect the ids of all related resources on this level.
+        steps = list()
+        level_ids = set()
+        for node, resources in frontier:
+            for relname, (path, children) in node.items():
+                try:
+                    relids = relatives_identifiers(relname, resources)
+                except errors.RelationshipNotFound:
+                    raise errors.UnresolvableIncludePath(path)
+                steps.append((children, relids))
+                level_ids.update(relids)
+
+        # Query only the relatives, which have not been fetched
+        # on a previous level yet.
+        missing = level_ids.difference(all_relatives)
+        if missing:
+            all_relatives.update((yield missing))
+
+        # The next relationship names in the paths are defined on the
+        # relatives, which have just been fetched.
+        frontier = list()
+        for children, relids in steps:
+            if not children:
+                continue
+            relatives = [
+                all_relatives[relid] for relid in relids\
+                if relid in all_relatives
+            ]
+            if relatives:
+                frontier.append((children, relatives))
+    return all_relatives
+
+
+def document_size(d):
+    """
+    Returns the number of resource objects in the *data* and *included* lists
+    of the JSONapi document *d*. This is a cheap estimate for the time needed
+    to encode the document.
+
+    :arg dict d:
+    """
+    if not isinstance(d, dict):
+        return 0
+    return sum(
+        len(d[key]) for key in ("data", "included")\
+        if isinstance(d.get(key), list)
+    )
+
+
+def iter_document(d, dumps, chunk_size=100):
+    """
+    Encodes the JSONapi document *d* chunk by chunk. The items of the top
+    level lists (*data* and *included*) are encoded in groups of
+    *chunk_size*, so that the encoded document is never held in memory as
+    a whole and the first bytes can be sent to the client early.
+
+    :arg dict d:
+    :arg dumps:
+        The function used to encode a single value to *bytes*.
+    :arg int chunk_size:
+        The number of list items, which are encoded at once.
+    """
+    yield b"{"
+    for i, (key, value) in enumerate(d.items()):
+        yield (b"," if i else b"") + dumps(key) + b":"
+        if isinstance(value, list):
+            yield b"["
+            for start in range(0, len(value), chunk_size):
+                chunk = b",".join(
+                    dumps(item) for item in value[start:start + chunk_size]
+                )
+                yield (b"," + chunk) if start else chunk
+            yield b"]"
+        else:
+            yield dumps(value)
+    yield b"}"
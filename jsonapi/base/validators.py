@@ -57,6 +57,16 @@ __all__ = [
 ]
 
 
+# The allowed members of the different objects. The sets are built once,
+# instead of on every call.
+RESOURCE_OBJECT_MEMBERS = frozenset(
+    ["id", "type", "attributes", "relationships", "links", "meta"]
+)
+RELATIONSHIP_OBJECT_MEMBERS = frozenset(["links", "data", "meta"])
+RESOURCE_IDENTIFIER_OBJECT_MEMBERS = frozenset(["id", "type", "meta"])
+LINK_OBJECT_MEMBERS = frozenset(["href", "meta"])
+
+
 def assert_resource_object(d, source_pointer="/"):
     """
     Asserts, that *d* is a JSONapi resource object.
@@ -74,7 +84,7 @@ def assert_resource_object(d, source_pointer="/"):
             source_pointer=source_pointer
         )
 
-    if not d.keys() <= {"id", "type", "attributes", "relationships", "links", "meta"}:
+    if not d.keys() <= RESOURCE_OBJECT_MEMBERS:
         raise InvalidDocument(
             detail=(
                 "A resource object may only contain these members: "\
@@ -184,7 +194,7 @@ def assert_relationship_object(d, source_pointer="/"):
             ),
             source_pointer=source_pointer
         )
-    if not d.keys() <= {"links", "data", "meta"}:
+    if not d.keys() <= RELATIONSHIP_OBJECT_MEMBERS:
         raise InvalidDocument(
             detail=(
                 "A relationship object may only contain the following members: "
@@ -220,6 +230,12 @@ def assert_resource_linkage(d, source_pointer="/"):
         assert_resource_identifier_object(d, source_pointer)
     elif isinstance(d, list):
         for i, item in enumerate(d):
+            # Fast path for the common case ``{"type": "...", "id": "..."}``.
+            # The source pointer is only built, if we need the verbose error.
+            if type(item) is dict and len(item) == 2\
+                and type(item.get("type")) is str\
+                and type(item.get("id")) is str:
+                continue
             assert_resource_identifier_object(
                 item, source_pointer + str(i) + "/"
             )
@@ -250,7 +266,7 @@ def assert_resource_identifier_object(d, source_pointer="/"):
             detail="A resource identifier object must be an object.",
             source_pointer=source_pointer
         )
-    if not d.keys() <= {"id", "type", "meta"}:
+    if not d.keys() <= RESOURCE_IDENTIFIER_OBJECT_MEMBERS:
         raise InvalidDocument(
             detail=(
                 "A resource identifier object can only contain these members: "
@@ -260,7 +276,7 @@ def assert_resource_identifier_object(d, source_pointer="/"):
         )
 
     if "meta" in d:
-        self.assert_meta_object(d["meta"], source_pointer + "meta/")
+        assert_meta_object(d["meta"], source_pointer + "meta/")
 
     if not "type" in d:
         raise InvalidDocument(
@@ -322,7 +338,7 @@ def assert_link_object(d, source_pointer="/"):
     if isinstance(d, str):
         pass
     elif isinstance(d, dict):
-        if not d.keys() <= {"href", "meta"}:
+        if not d.keys() <= LINK_OBJECT_MEMBERS:
             raise InvalidDocument(
                 detail=(
                     "A link object can only contain these members: "
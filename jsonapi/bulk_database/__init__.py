@@ -54,10 +54,18 @@ models to the JSONapi, you can use the bulk database:
     bulk_db.add_type(user_schema, sql_db)
     bulk_db.add_type(session_schema, redis_db)
 
+asyncio
+-------
+
+If you use the :mod:`jsonapi.asyncio` API, use the bulk database in
+:mod:`jsonapi.bulk_database.asyncio`. It queries the database adapters
+concurrently.
+
 API
 ---
 
 .. autoclass:: jsonapi.bulk_database.database.Database
+.. autoclass:: jsonapi.bulk_database.asyncio.Database
 """
 
 # local
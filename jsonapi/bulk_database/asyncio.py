@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Benedikt Schmitt
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+jsonapi.bulk_database.asyncio
+=============================
+
+The bulk database for the :mod:`jsonapi.asyncio` API. The requests to the
+different database adapters are sent concurrently, so the time needed for
+*get_many()* and *commit()* is the time of the slowest adapter and not the
+sum of all adapters.
+
+.. code-block:: python3
+
+    bulk_db = jsonapi.bulk_database.asyncio.Database()
+    bulk_db.add_schema(user_schema, motor_db)
+    bulk_db.add_schema(session_schema, sql_db)
+
+    api = jsonapi.asyncio.api.API("/api", db=bulk_db)
+
+The sessions of synchronous database adapters (e.g. sqlalchemy) are wrapped
+in a :class:`~jsonapi.asyncio.database.SyncToAsyncSession` and run in the
+*executor* of the bulk database.
+"""
+
+# std
+import asyncio
+
+# local
+import jsonapi
+import jsonapi.asyncio.database
+from . import database
+
+
+__all__ = [
+    "Database",
+    "Session"
+]
+
+
+class Database(database.Database):
+    """
+    Works like :class:`jsonapi.bulk_database.database.Database`, but creates
+    asynchronous sessions.
+
+    :arg jsonapi.base.api.API api:
+    :arg concurrent.futures.Executor executor:
+        The executor for the calls of synchronous database adapters. If None,
+        the default executor of the event loop is used.
+    """
+
+    def session(self):
+        return Session(api=self.api, db=self)
+
+
+class Session(database.Session, jsonapi.asyncio.database.Session):
+    """
+    Works like :class:`jsonapi.bulk_database.database.Session`, but the
+    methods listed in :class:`jsonapi.asyncio.database.Session` return
+    *awaitables*.
+
+    :arg jsonapi.base.api.API api:
+    :arg jsonapi.bulk_database.asyncio.Database db:
+    """
+
+    def session_by_db(self, db):
+        """
+        If a session for the database adapter *db* already exists, it is
+        returned. Otherwise, a new session is created. The session of a
+        synchronous adapter is wrapped in a
+        :class:`~jsonapi.asyncio.database.SyncToAsyncSession`.
+
+        :arg jsonapi.base.database.Database db:
+        :rtype: jsonapi.asyncio.database.Session
+        """
+        session = self._sessions.get(db)
+        if session is None:
+            session = db.session()
+            if not isinstance(session, jsonapi.asyncio.database.Session):
+                session = jsonapi.asyncio.database.SyncToAsyncSession(
+                    session, self.db.executor
+                )
+            self._sessions[db] = session
+        return session
+
+    async def query(self, typename,
+        *, order=None, limit=None, offset=None, filters=None, after=None
+        ):
+        """
+        """
+        session = self.session(typename)
+        return await session.query(
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
+        )
+
+    async def query_size(self, typename,
+        *, order=None, limit=None, offset=None, filters=None, after=None
+        ):
+        """
+        """
+        session = self.session(typename)
+        return await session.query_size(
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
+        )
+
+    async def get(self, identifier, required=False):
+        """
+        """
+        resource = self._identity_map.get(identifier)
+        if resource is not None:
+            return resource
+
+        # Only the calls, which must query a database, are counted.
+        self._count_get()
+
+        typename, resource_id = identifier
+        session = self.session(typename)
+        resource = await session.get(identifier, required=required)
+        self._remember({identifier: resource})
+        return resource
+
+    async def get_many(self, identifiers, required=False):
+        """
+        Loads the resources with one *get_many()* call per database adapter.
+        The calls are run concurrently.
+
+        :seealso: :meth:`jsonapi.bulk_database.database.Session.get_many`
+        """
+        result, buckets = self._split_identifiers(identifiers)
+
+        results = await asyncio.gather(*[
+            self.session_by_db(db).get_many(identifiers, required=required)
+            for db, identifiers in buckets.items()
+        ])
+
+        fetched = dict()
+        for resources in results:
+            fetched.update(resources)
+
+        self._remember(fetched)
+        result.update(fetched)
+        return result
+
+    async def commit(self):
+        """
+        Commits the sessions of all database adapters concurrently.
+        """
+        await asyncio.gather(*[
+            session.commit() for session in self._sessions.values()
+        ])
+        self._get_calls = 0
+        return None
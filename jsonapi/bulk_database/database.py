@@ -28,10 +28,12 @@ jsonapi.bulk_database.database
 """
 
 # std
-from itertools import groupby
+import concurrent.futures
+import logging
 
 # local
 import jsonapi
+from jsonapi.base.utilities import ensure_identifier
 
 
 __all__ = [
@@ -39,17 +41,29 @@ __all__ = [
 ]
 
 
+LOG = logging.getLogger(__file__)
+
+
 class Database(jsonapi.base.database.Database):
     """
     This adapter is only a *proxy*. You must associate each type with a database
     adapter, on setup.
+
+    :arg jsonapi.base.api.API api:
+    :arg concurrent.futures.Executor executor:
+        If given, the requests to the different database adapters in
+        :meth:`Session.get_many` are run concurrently in this executor. Only
+        use this, if the sessions of your adapters may be used from another
+        thread.
     """
 
-    def __init__(self, api):
+    def __init__(self, api=None, executor=None):
         super().__init__(api)
 
         # typename to database adapter
         self._dbs = dict()
+
+        self.executor = executor
         return None
 
     def session(self):
@@ -104,6 +118,11 @@ class Session(jsonapi.base.database.Session):
     :arg jsonapi.bulk_database.database.Database db:
     """
 
+    #: If :meth:`get` has to query the database this often before the session
+    #: is committed, a warning is logged, because the resources should
+    #: probably be loaded with one :meth:`get_many` call.
+    GET_WARNING_THRESHOLD = 100
+
     def __init__(self, api, db):
         """
         """
@@ -112,6 +131,14 @@ class Session(jsonapi.base.database.Session):
 
         # Maps the database adapter to the database session.
         self._sessions = dict()
+
+        # The number of get() calls since the last commit, which have not been
+        # answered by the identity map.
+        self._get_calls = 0
+
+        # Maps the identifier to the resources, which have already been loaded
+        # with this session, so that they are not fetched twice.
+        self._identity_map = dict()
         return None
 
     def session(self, typename):
@@ -123,10 +150,7 @@ class Session(jsonapi.base.database.Session):
         :arg str typename:
         :rtype: jsonapi.base.database.Session
         """
-        db = self.db.get_db(typename)
-        if not db in self._sessions:
-            self._sessions[db] = db.session()
-        return self._sessions[db]
+        return self.session_by_db(self.db.get_db(typename))
 
     def session_by_db(self, db):
         """
@@ -136,73 +160,172 @@ class Session(jsonapi.base.database.Session):
         :arg jsonapi.base.database.Database db:
         :rtype: jsonapi.base.database.Session
         """
-        if not db in self._sessions:
-            self._sessions[db] = db.session()
-        return self._sessions[db]
+        session = self._sessions.get(db)
+        if session is None:
+            session = self._sessions[db] = db.session()
+        return session
+
+    def _group_by_db(self, resources):
+        """
+        Groups the *resources* by their database adapter.
+
+        :arg resources:
+        :rtype: dict
+        :returns: A dictionary, which maps the database adapter to the list
+            of its resources.
+        """
+        get_db = self.db.get_db
+        get_typename = self.api.get_typename
+
+        # The resources are usually of only a few classes, so we look up the
+        # database adapter only once per class.
+        dbs = dict()
+        buckets = dict()
+        for resource in resources:
+            resource_class = type(resource)
+            db = dbs.get(resource_class)
+            if db is None:
+                db = dbs[resource_class] = get_db(get_typename(resource_class))
+            buckets.setdefault(db, []).append(resource)
+        return buckets
 
     def query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         session = self.session(typename)
         return session.query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
 
     def query_size(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         session = self.session(typename)
         return session.query_size(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
+        )
+
+    def _count_get(self):
+        """
+        Counts the :meth:`get` calls, which miss the identity map, and logs a
+        warning, if the :attr:`GET_WARNING_THRESHOLD` is reached.
+        """
+        self._get_calls += 1
+        if self._get_calls == self.GET_WARNING_THRESHOLD:
+            LOG.warning(
+                "get() has been called %d times on the same bulk session. "
+                "Use get_many() to load many resources with one call.",
+                self._get_calls
+            )
+        return None
+
+    def _split_identifiers(self, identifiers):
+        """
+        Looks up the *identifiers* in the identity map and groups the missing
+        ones by their database adapter. Returns a tuple ``(known, buckets)``,
+        where *known* maps the identifiers to the already loaded resources and
+        *buckets* maps the database adapter to the list of missing
+        identifiers.
+
+        :arg identifiers:
+        """
+        identity_map = self._identity_map
+        get_db = self.db.get_db
+
+        known = dict()
+        buckets = dict()
+        for identifier in identifiers:
+            resource = identity_map.get(identifier)
+            if resource is not None:
+                known[identifier] = resource
+            else:
+                buckets.setdefault(get_db(identifier[0]), []).append(identifier)
+        return (known, buckets)
+
+    def _remember(self, resources):
+        """
+        Adds the loaded *resources* to the identity map.
+
+        :arg dict resources:
+            Maps the identifiers to the resources (or None).
+        """
+        self._identity_map.update(
+            (identifier, resource) for identifier, resource in resources.items()\
+            if resource is not None
         )
+        return None
 
-    def get(self, identifier):
+    def get(self, identifier, required=False):
         """
         """
+        resource = self._identity_map.get(identifier)
+        if resource is not None:
+            return resource
+
+        # Only the calls, which must query a database, are counted.
+        self._count_get()
+
         typename, resource_id = identifier
         session = self.session(typename)
-        return session.get(identifier)
+        resource = session.get(identifier, required=required)
+        self._remember({identifier: resource})
+        return resource
 
-    def get_many(self, identifiers):
+    def get_many(self, identifiers, required=False):
         """
-        :seealso: :meth:`Session.get_many`
-        """
-        result = dict()
+        Loads the resources with one *get_many()* call per database adapter. If
+        the :attr:`Database.executor` is set and more than one adapter is
+        involved, the calls are run concurrently. Resources, which have already
+        been loaded with this session, are not fetched again.
 
-        # Group the resources by the typenames
-        group_key = lambda identifier: identifier[0]
-        for typename, identifiers in groupby(identifiers, group_key):
-            # We need to *list()* the identifiers, because groupby() allows
-            # us to only iterate once over them.
-            identifiers = list(identifiers)
-            session = self.session(typename)
-            resources = session.get_many(identifiers)
-            result.update(resources)
+        :seealso: :meth:`jsonapi.base.database.Session.get_many`
+        """
+        result, buckets = self._split_identifiers(identifiers)
+
+        fetched = dict()
+        executor = self.db.executor
+        if executor is None or len(buckets) < 2:
+            for db, identifiers in buckets.items():
+                session = self.session_by_db(db)
+                fetched.update(session.get_many(identifiers, required=required))
+        else:
+            futures = [
+                executor.submit(
+                    self.session_by_db(db).get_many, identifiers,
+                    required=required
+                )
+                for db, identifiers in buckets.items()
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                fetched.update(future.result())
+
+        self._remember(fetched)
+        result.update(fetched)
         return result
 
     def save(self, resources):
         """
         """
-        for typename, resources in groupby(resources, self.api.get_typename):
-            # We need to *list()* the resources, because groupby() allows
-            # us to only iterate once over them.
-            resources = list(resources)
-            session = self.session(typename)
+        for db, resources in self._group_by_db(resources).items():
+            session = self.session_by_db(db)
             session.save(resources)
         return None
 
     def delete(self, resources):
         """
         """
-        for typename, resources in groupby(resources, self.api.get_typename):
-            # We need to *list()* the resources, because groupby() allows
-            # us to only iterate once over them.
-            resources = list(resources)
-            session = self.session(typename)
+        resources = list(resources)
+        for resource in resources:
+            self._identity_map.pop(ensure_identifier(resource), None)
+
+        for db, resources in self._group_by_db(resources).items():
+            session = self.session_by_db(db)
             session.delete(resources)
         return None
 
@@ -211,4 +334,5 @@ class Session(jsonapi.base.database.Session):
         """
         for session in self._sessions.values():
             session.commit()
+        self._get_calls = 0
         return None
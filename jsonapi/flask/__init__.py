@@ -72,6 +72,18 @@ The API instance is also added to the jinja environment:
         </a>
     </p>
 
+JSON encoding
+-------------
+
+If `orjson <https://github.com/ijl/orjson>`_ is installed, the API uses it
+to encode the response documents. The encoded *bytes* are put directly into
+the flask response body and large documents are streamed to the client in
+chunks. You can install it as an extra:
+
+.. code-block:: bash
+
+    pip install py-jsonapi[orjson]
+
 API
 ---
 
@@ -36,6 +36,7 @@ import werkzeug
 
 # local
 import jsonapi
+from jsonapi.base.utilities import document_size
 
 
 __all__ = [
@@ -47,6 +48,11 @@ __all__ = [
 LOG = logging.getLogger(__file__)
 
 
+#: The number of resource objects, which are encoded and sent as one chunk,
+#: if a large document is streamed to the client.
+STREAM_CHUNK_SIZE = 100
+
+
 def get_request():
     """
     Transforms the current flask request object in to a jsonapi request object.
@@ -61,12 +67,20 @@ def get_request():
     return jsonapi.base.Request(uri, method, headers, body)
 
 
-def to_response(japi_response):
+def to_response(japi_response, api=None):
     """
-    Transforms the jsonapi response object into a flask response.
+    Transforms the jsonapi response object into a flask response. If the
+    body is a JSON document, which has not been encoded yet (see
+    :meth:`FlaskAPI.write_document`), it is encoded with
+    :meth:`~jsonapi.base.api.API.dump_json_stream` of the *api* and streamed
+    to the client.
     """
     if japi_response.is_file:
         flask_response = flask.send_file(japi_response.file)
+    elif api is not None and japi_response.pending_document is not None:
+        flask_response = flask.Response(api.dump_json_stream(
+            japi_response.pending_document, STREAM_CHUNK_SIZE
+        ))
     elif japi_response.has_body:
         flask_response = flask.Response(japi_response.body)
     else:
@@ -124,6 +138,7 @@ class FlaskAPI(jsonapi.base.api.API):
             )
 
         self._flask_app = app
+        self._invalidate_dispatcher()
 
         # Add the url rule.
         app.add_url_rule(
@@ -141,13 +156,32 @@ class FlaskAPI(jsonapi.base.api.API):
         app.jinja_env.globals["jsonapi"] = current_api
         return None
 
+    def write_document(self, response, d):
+        """
+        Documents with more than :data:`STREAM_CHUNK_SIZE` resource objects
+        are not encoded at once. They are streamed to the client in chunks
+        (see :func:`to_response`). The *body* of the *response* is still
+        available as *bytes*, but encoded only on access.
+
+        Streaming is only used with :mod:`orjson` and not in the debug mode
+        (indented output).
+
+        :arg jsonapi.base.response.Response response:
+        :arg dict d:
+        """
+        if jsonapi.base.api.orjson is not None and not self.debug \
+            and document_size(d) > STREAM_CHUNK_SIZE:
+            response.set_document(d, self.dump_json)
+            return None
+        return super().write_document(response, d)
+
     def handle_request(self, path=None):
         """
         Handles a request to the API.
         """
         req = get_request()
         resp = super().handle_request(req)
-        return to_response(resp)
+        return to_response(resp, self)
 
 
 #: Returns the FlaskAPI instance, which is by used by the current flask
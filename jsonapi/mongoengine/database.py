@@ -34,10 +34,12 @@ from itertools import groupby
 
 # third party
 import mongoengine
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 
 # local
 import jsonapi
+from jsonapi.base import errors
 from . import schema
 
 
@@ -47,6 +49,31 @@ __all__ = [
 ]
 
 
+#: Maps the filter names (see :attr:`jsonapi.base.request.Request.japi_filters`)
+#: to the mongoengine query operator suffix.
+FILTER_OPERATORS = {
+    "eq": "",
+    "ne": "__ne",
+    "lt": "__lt",
+    "lte": "__lte",
+    "gt": "__gt",
+    "gte": "__gte",
+    "in": "__in",
+    "nin": "__nin",
+    "all": "__all",
+    "size": "__size",
+    "exists": "__exists",
+    "iexact": "__iexact",
+    "contains": "__contains",
+    "icontains": "__icontains",
+    "startswith": "__startswith",
+    "istartswith": "__istartswith",
+    "endswith": "__endswith",
+    "iendswith": "__iendswith",
+    "match": "__match"
+}
+
+
 class Database(jsonapi.base.database.Database):
     """
     This adapter must be chosen for mongoengine models. We assume that the
@@ -78,48 +105,16 @@ class Session(jsonapi.base.database.Session):
             # We only allow filtering for mongoengine attributes.
             attribute = schema_.attributes.get(fieldname)
             if not isinstance(attribute, schema.Attribute):
-                raise errors.UnfilterableField(filtername, fieldname)
-
-            if filtername == "eq":
-                d[attribute.name] = value
-            elif filtername == "ne":
-                d[attribute.name + "__ne"] = value
-            elif filtername == "lt":
-                d[attribute.name + "__lt"] = value
-            elif filtername == "lte":
-                d[attribute.name + "__lte"] = value
-            elif filtername == "gt":
-                d[attribute.name + "__gt"] = value
-            elif filtername == "gte":
-                d[attribute.name + "__gte"] = value
-            elif filtername == "in":
-                d[attribute.name + "__in"] = value
-            elif filtername == "nin":
-                d[attribute.name + "__nin"] = value
-            elif filtername == "all":
-                d[attribute.name + "__all"] = value
-            elif filtername == "size":
-                d[attribute.name + "__size"] = value
-            elif filtername == "exists":
-                d[attribute.name + "__exists"] = value
-            elif filtername == "iexact":
-                d[attribute.name + "__iexact"] = value
-            elif filtername == "contains":
-                d[attribute.name + "__contains"] = value
-            elif filtername == "icontains":
-                d[attribute.name + "__icontains"] = value
-            elif filtername == "startswith":
-                d[attribute.name + "__startswith"] = value
-            elif filtername == "istartswith":
-                d[attribute.name + "__istartswith"] = value
-            elif filtername == "endswith":
-                d[attribute.name + "__endswith"] = value
-            elif filtername == "iendswith":
-                d[attribute.name + "__iendswith"] = value
-            elif filtername == "match":
-                d[attribute.name + "__match"] = value
-            else:
-                raise errors.UnfilterableField(filtername, fieldname)
+                raise errors.UnfilterableField(
+                    schema_.typename, filtername, fieldname
+                )
+
+            operator = FILTER_OPERATORS.get(filtername)
+            if operator is None:
+                raise errors.UnfilterableField(
+                    schema_.typename, filtername, fieldname
+                )
+            d[attribute.name + operator] = value
         return d
 
     def _build_order_criterion(self, schema_, order):
@@ -142,7 +137,7 @@ class Session(jsonapi.base.database.Session):
         return criterion
 
     def _build_query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
@@ -159,6 +154,22 @@ class Session(jsonapi.base.database.Session):
             order = self._build_order_criterion(schema_, order)
             query = query.order_by(*order)
 
+        # Keyset pagination
+        if after is not None:
+            id_field = resource_class._fields[resource_class._meta["id_field"]]
+            try:
+                after = id_field.to_python(after)
+                id_field.validate(after)
+            except (
+                mongoengine.ValidationError, InvalidId, TypeError, ValueError
+                ):
+                raise errors.BadRequest(
+                    detail="'page[after]' is not a valid id for '{}'."\
+                        .format(typename),
+                    source_parameter="page[after]"
+                )
+            query = query.filter(id__gt=after).order_by("id")
+
         if offset:
             query = query.skip(offset)
 
@@ -167,23 +178,25 @@ class Session(jsonapi.base.database.Session):
         return query
 
     def query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         query = self._build_query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
         resources = list(query)
         return resources
 
     def query_size(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         query = self._build_query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
         return query.count()
 
@@ -202,8 +215,11 @@ class Session(jsonapi.base.database.Session):
         """
         results = dict()
 
-        # Group the identifiers by the typenames.
+        # Group the identifiers by the typenames. *groupby()* only groups
+        # consecutive items, so we must sort them first to get only one query
+        # per type.
         group_key = lambda identifier: identifier[0]
+        identifiers = sorted(identifiers, key=group_key)
         for typename, identifiers in groupby(identifiers, group_key):
             resource_class = self.api.get_resource_class(typename)
             schema_ = self.api.get_schema(typename)
@@ -219,7 +235,7 @@ class Session(jsonapi.base.database.Session):
             resources = resource_class.objects().in_bulk(resource_ids)
 
             # Break, if a resource does not exist.
-            not_found = resources.keys() - resource_ids
+            not_found = set(resource_ids) - resources.keys()
             if required and not_found:
                 raise jsonapi.base.errors.ResourceNotFound(
                     identifier=(typename, not_found.pop())
@@ -36,10 +36,12 @@ from itertools import groupby
 # third party
 import motorengine
 from tornado.platform.asyncio import to_asyncio_future
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 
 # local
 import jsonapi
+from jsonapi.base import errors
 from . import schema
 
 
@@ -49,7 +51,32 @@ __all__ = [
 ]
 
 
-class Database(jsonapi.base.database.Database):
+#: Maps the filter names (see :attr:`jsonapi.base.request.Request.japi_filters`)
+#: to the motorengine query operator suffix.
+FILTER_OPERATORS = {
+    "eq": "",
+    "ne": "__ne",
+    "lt": "__lt",
+    "lte": "__lte",
+    "gt": "__gt",
+    "gte": "__gte",
+    "in": "__in",
+    "nin": "__nin",
+    "all": "__all",
+    "size": "__size",
+    "exists": "__exists",
+    "iexact": "__iexact",
+    "contains": "__contains",
+    "icontains": "__icontains",
+    "startswith": "__startswith",
+    "istartswith": "__istartswith",
+    "endswith": "__endswith",
+    "iendswith": "__iendswith",
+    "match": "__match"
+}
+
+
+class Database(jsonapi.asyncio.database.Database):
     """
     This adapter must be chosen for motorengine models. We assume that the
     database connection has been created with ``motorengine.connect()``.
@@ -92,48 +119,12 @@ class Session(jsonapi.asyncio.database.Session):
                     schema_.typename, filtername, fieldname
                 )
 
-            if filtername == "eq":
-                d[attribute.name] = value
-            elif filtername == "ne":
-                d[attribute.name + "__ne"] = value
-            elif filtername == "lt":
-                d[attribute.name + "__lt"] = value
-            elif filtername == "lte":
-                d[attribute.name + "__lte"] = value
-            elif filtername == "gt":
-                d[attribute.name + "__gt"] = value
-            elif filtername == "gte":
-                d[attribute.name + "__gte"] = value
-            elif filtername == "in":
-                d[attribute.name + "__in"] = value
-            elif filtername == "nin":
-                d[attribute.name + "__nin"] = value
-            elif filtername == "all":
-                d[attribute.name + "__all"] = value
-            elif filtername == "size":
-                d[attribute.name + "__size"] = value
-            elif filtername == "exists":
-                d[attribute.name + "__exists"] = value
-            elif filtername == "iexact":
-                d[attribute.name + "__iexact"] = value
-            elif filtername == "contains":
-                d[attribute.name + "__contains"] = value
-            elif filtername == "icontains":
-                d[attribute.name + "__icontains"] = value
-            elif filtername == "startswith":
-                d[attribute.name + "__startswith"] = value
-            elif filtername == "istartswith":
-                d[attribute.name + "__istartswith"] = value
-            elif filtername == "endswith":
-                d[attribute.name + "__endswith"] = value
-            elif filtername == "iendswith":
-                d[attribute.name + "__iendswith"] = value
-            elif filtername == "match":
-                d[attribute.name + "__match"] = value
-            else:
+            operator = FILTER_OPERATORS.get(filtername)
+            if operator is None:
                 raise errors.UnfilterableField(
                     schema_.typename, filtername, fieldname
                 )
+            d[attribute.name + operator] = value
 
         query = query.filter(**d)
         return query
@@ -155,10 +146,17 @@ class Session(jsonapi.asyncio.database.Session):
         return query
 
     def _build_query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
+        if after is not None:
+            raise errors.BadRequest(
+                detail="'page[after]' is not supported for '{}'."\
+                    .format(typename),
+                source_parameter="page[after]"
+            )
+
         resource_class = self.api.get_resource_class(typename)
         schema_ = self.api.get_schema(typename)
         query = resource_class.objects
@@ -173,50 +171,95 @@ class Session(jsonapi.asyncio.database.Session):
         return query
 
     def query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         query = self._build_query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
         return to_asyncio_future(query.find_all())
 
     def query_size(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         query = self._build_query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
         return to_asyncio_future(query.count())
 
-    @asyncio.coroutine
-    def get(self, identifier, required=False):
+    async def get(self, identifier, required=False):
         """
         """
         typename, resource_id = identifier
         resource_class = self.api.get_resource_class(typename)
 
-        resource = yield from to_asyncio_future(
+        resource = await to_asyncio_future(
             resource_class.objects.get(resource_id)
         )
         if required and resource is None:
             raise jsonapi.base.errors.ResourceNotFound(identifier)
         return resource
 
-    @asyncio.coroutine
-    def get_many(self, identifiers, required=False):
+    async def _get_many_of_type(self, typename, resource_ids, required):
         """
-        .. todo:: Use bulk get.
+        Loads all resources of the type *typename* with one ``$in`` query.
         """
+        resource_class = self.api.get_resource_class(typename)
+
+        # Malformed ids can not exist in the database.
+        object_ids = dict()
+        for resource_id in resource_ids:
+            try:
+                object_ids[resource_id] = ObjectId(resource_id)
+            except (InvalidId, TypeError):
+                pass
+
+        # motorengine has no bulk get, so we query the motor collection
+        # directly and build the documents from the raw sons.
+        found = dict()
+        if object_ids:
+            cursor = resource_class.objects.coll().find(
+                {"_id": {"$in": list(object_ids.values())}}
+            )
+            sons = await to_asyncio_future(cursor.to_list(length=None))
+            found = {son["_id"]: resource_class.from_son(son) for son in sons}
+
+        # Map each identifier to its resource or None and break, if a
+        # resource does not exist.
         resources = dict()
-        for identifier in identifiers:
-            resource = yield from self.get(identifier, required)
+        for resource_id in resource_ids:
+            identifier = (typename, resource_id)
+            resource = found.get(object_ids.get(resource_id))
+            if required and resource is None:
+                raise jsonapi.base.errors.ResourceNotFound(identifier=identifier)
             resources[identifier] = resource
         return resources
 
+    async def get_many(self, identifiers, required=False):
+        """
+        Fetches the resources with one query per type. The queries for the
+        different types run concurrently.
+        """
+        # Group the identifiers by the typenames. *groupby()* only groups
+        # consecutive items, so we must sort them first.
+        group_key = lambda identifier: identifier[0]
+        identifiers = sorted(identifiers, key=group_key)
+        tasks = [
+            self._get_many_of_type(
+                typename, [e[1] for e in identifiers], required
+            ) for typename, identifiers in groupby(identifiers, group_key)
+        ]
+
+        results = dict()
+        for resources in await asyncio.gather(*tasks):
+            results.update(resources)
+        return results
+
     def save(self, resources):
         """
         """
@@ -245,17 +288,16 @@ class Session(jsonapi.asyncio.database.Session):
                 self._added_resources.discard(resource)
         return None
 
-    @asyncio.coroutine
-    def commit(self):
+    async def commit(self):
         """
         .. todo:: Use bulk insert and bulk delete.
         """
         for resource in self._added_resources:
-            yield from to_asyncio_future(resource.save())
+            await to_asyncio_future(resource.save())
             
         for resource in self._saved_resources.values():
-            yield from to_asyncio_future(resource.save())
+            await to_asyncio_future(resource.save())
 
         for resource in self._deleted_resources.values():
-            yield from to_asyncio_future(resource.delete())
+            await to_asyncio_future(resource.delete())
         return None
@@ -73,12 +73,21 @@ API
 .. autoclass:: jsonapi.sqlalchemy.schema.Schema
 .. autoclass:: jsonapi.sqlalchemy.database.Database
 
+Computed attributes
+~~~~~~~~~~~~~~~~~~~
+
+Attributes defined with :func:`~sqlalchemy.orm.column_property` and
+:class:`~sqlalchemy.ext.hybrid.hybrid_property` are found automatic. Prefer
+them over *attribute* markers, if the value can be computed by the database:
+It is then computed in the same query, which loads the resources, and the
+attribute can be used for filtering and sorting.
+
 Todo
 ----
 
 .. todo::
 
-    Find hybrid methods and properties
+    Find hybrid methods
 """
 
 from .database import Database
@@ -30,11 +30,15 @@ The database adapter for *sqlalchemy*.
 """
 
 # std
-from itertools import groupby
 import logging
 
+# third party
+import sqlalchemy
+import sqlalchemy.orm
+
 # local
 import jsonapi
+from jsonapi.base.utilities import walk_include_paths
 from . import schema
 
 
@@ -47,6 +51,32 @@ __all__ = [
 LOG = logging.getLogger(__file__)
 
 
+#: Maps the filter names (see :attr:`jsonapi.base.request.Request.japi_filters`)
+#: to a function, which receives the sqlalchemy column and the filter value
+#: and returns the filter criterion.
+FILTER_CRITERIONS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "in": lambda column, value: column.in_(value),
+    "nin": lambda column, value: column.notin_(value),
+    "exists": lambda column, value: column != None,
+    # .. todo:: Escape *value* in the *ilike* filters.
+    "iexact": lambda column, value: column.ilike(value),
+    "contains": lambda column, value: column.contains(value),
+    "icontains": lambda column, value: column.ilike("%" + value + "%"),
+    "startswith": lambda column, value: column.startswith(value),
+    "istartswith": lambda column, value: column.ilike(value + "%"),
+    "endswith": lambda column, value: column.endswith(value),
+    "iendswith": lambda column, value: column.ilike("%" + value),
+    # .. todo:: This only works for MYSQL
+    "match": lambda column, value: column.op("regexp")(value)
+}
+
+
 class Database(jsonapi.base.database.Database):
     """
     This adapter must be chosen for sqlalchemy models.
@@ -55,14 +85,23 @@ class Database(jsonapi.base.database.Database):
         The function used to get a sqlalchemy session. If not given, the api
         settings must contain a `sqlalchemy_sessionmaker` key.
     :arg jsonapi.base.api.API api:
+    :arg int compiled_cache_size:
+        The number of compiled SQL statements, which are cached and shared
+        between all sessions. The queries of the collection endpoints only
+        differ in the bound parameters (filter values, limit, offset, ...), so
+        they must be compiled only once. Set it to *0* to disable the cache.
     """
 
-    def __init__(self, sessionmaker=None, api=None):
+    def __init__(self, sessionmaker=None, api=None, compiled_cache_size=500):
         super().__init__(api=api)
 
         if sessionmaker is None and api is not None:
             sessionmaker = self.api.settings["sqlalchemy_sessionmaker"]
         self.sessionmaker = sessionmaker
+
+        #: Maps the structure of a query to its compiled SQL statement.
+        self.compiled_cache = sqlalchemy.util.LRUCache(compiled_cache_size)\
+            if compiled_cache_size else None
         return None
 
     def init_api(self, api):
@@ -72,7 +111,9 @@ class Database(jsonapi.base.database.Database):
         return None
 
     def session(self):
-        return Session(self.api, self.sessionmaker())
+        return Session(
+            self.api, self.sessionmaker(), compiled_cache=self.compiled_cache
+        )
 
 
 class Session(jsonapi.base.database.Session):
@@ -82,15 +123,29 @@ class Session(jsonapi.base.database.Session):
     :arg jsonapi.base.api.API api:
     :arg sqla_session:
         SQLAlchemy session instance
+    :arg compiled_cache:
+        A dictionary, which is used as sqlalchemy *compiled_cache*
+        execution option for the queries.
     """
 
-    def __init__(self, api, sqla_session):
+    def __init__(self, api, sqla_session, compiled_cache=None):
         """
         """
         super().__init__(api)
         self.sqla_session = sqla_session
+        self.compiled_cache = compiled_cache
         return None
 
+    def _query(self, resource_class):
+        """
+        Returns a new sqlalchemy query for the *resource_class*, which uses
+        the :attr:`compiled_cache`.
+        """
+        query = self.sqla_session.query(resource_class)
+        if self.compiled_cache is not None:
+            query = query.execution_options(compiled_cache=self.compiled_cache)
+        return query
+
     def _build_filter_criterion(self, schema_, filters):
         """
         Builds the argument for the sqlalchemy query method
@@ -106,55 +161,16 @@ class Session(jsonapi.base.database.Session):
             # For the moment, we only allow filterting on attributes.
             attr = schema_.attributes.get(fieldname)
             if not isinstance(attr, schema.Attribute):
-                raise jsonapi.base.errors.UnfilterableField(filtername, fieldname)
-
-            if filtername == "eq":
-                criterions.append(attr.class_attr == value)
-            elif filtername == "ne":
-                criterions.append(attr.class_attr != value)
-            elif filtername == "lt":
-                criterions.append(attr.class_attr < value)
-            elif filtername == "lte":
-                criterions.append(attr.class_attr <= value)
-            elif filtername == "gt":
-                criterions.append(attr.class_attr > value)
-            elif filtername == "gte":
-                criterions.append(attr.class_attr >= value)
-            elif filtername == "in":
-                criterions.append(attr.class_attr.in_(value))
-            elif filtername == "nin":
-                criterions.append(attr.class_attr.notin_(value))
-            elif filtername == "all":
-                # .. todo:: Implement it.
-                raise jsonapi.base.errors.UnfilterableField(filtername, fieldname)
-            elif filtername == "size":
-                # .. todo:: Implement it.
-                raise jsonapi.base.errors.UnfilterableField(filtername, fieldname)
-            elif filtername == "exists":
-                criterions.append(attr.class_attr != None)
-            elif filtername == "iexact":
-                # .. todo:: Escape *value*
-                criterions.append(attr.class_attr.ilike(value))
-            elif filtername == "contains":
-                criterions.append(attr.class_attr.contains(value))
-            elif filtername == "icontains":
-                # .. todo:: Escape *value*
-                criterions.append(attr.class_attr.ilike("%" + value + "%"))
-            elif filtername == "startswith":
-                criterions.append(attr.class_attr.startswith(value))
-            elif filtername == "istartswith":
-                # .. todo:: Escape *value*
-                criterions.append(attr.class_attr.ilike(value + "%"))
-            elif filtername == "endswith":
-                criterions.append(attr.class_attr.endswith(value))
-            elif filtername == "iendswith":
-                # .. todo:: Escape *value*
-                criterions.append(attr.class_attr.ilike("%" + value))
-            elif filtername == "match":
-                # .. todo:: This only works for MYSQL
-                criterions.append(attr.class_attr.op("regexp")(value))
-            else:
-                raise jsonapi.base.errors.UnfilterableField(filtername, fieldname)
+                raise jsonapi.base.errors.UnfilterableField(
+                    schema_.typename, filtername, fieldname
+                )
+
+            criterion = FILTER_CRITERIONS.get(filtername)
+            if criterion is None:
+                raise jsonapi.base.errors.UnfilterableField(
+                    schema_.typename, filtername, fieldname
+                )
+            criterions.append(criterion(attr.class_attr, value))
         return criterions
 
     def _build_order_criterion(self, schema_, order):
@@ -181,7 +197,7 @@ class Session(jsonapi.base.database.Session):
         return criterions
 
     def _build_query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         Maps the arguments to a sqlalchemy query object and returns it.
@@ -189,7 +205,7 @@ class Session(jsonapi.base.database.Session):
         resource_class = self.api.get_resource_class(typename)
         schema_ = self.api.get_schema(typename)
 
-        query = self.sqla_session.query(resource_class)
+        query = self._query(resource_class)
 
         if filters:
             filter_criterion = self._build_filter_criterion(schema_, filters)
@@ -199,6 +215,26 @@ class Session(jsonapi.base.database.Session):
             order_criterion = self._build_order_criterion(schema_, order)
             query = query.order_by(*order_criterion)
 
+        # Keyset pagination: Seek to the first resource after the id *after*
+        # using the primary key index.
+        if after is not None:
+            primary_key = sqlalchemy.inspect(resource_class).primary_key[0]
+            try:
+                python_type = primary_key.type.python_type
+            except NotImplementedError:
+                # The database converts the value.
+                python_type = None
+            if python_type is not None:
+                try:
+                    after = python_type(after)
+                except (TypeError, ValueError):
+                    raise jsonapi.base.errors.BadRequest(
+                        detail="'page[after]' is not a valid id for '{}'."\
+                            .format(typename),
+                        source_parameter="page[after]"
+                    )
+            query = query.filter(primary_key > after).order_by(primary_key)
+
         if offset:
             query = query.offset(offset)
 
@@ -207,48 +243,250 @@ class Session(jsonapi.base.database.Session):
         return query
 
     def query(self, typename,
-        *, order=None, limit=None, offset=None, filters=None
+        *, order=None, limit=None, offset=None, filters=None, after=None
         ):
         """
         """
         query = self._build_query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
+
+        # Load the relationships of all resources in the result eagerly, so
+        # that the serializer does not trigger one query per resource.
+        schema_ = self.api.get_schema(typename)
+        if isinstance(schema_, schema.Schema):
+            query = query.options(*schema_.loader_options)
         return list(query)
 
     def query_size(self, typename,
-        *, order=None, limit=None, offset=None, filters
+        *, order=None, limit=None, offset=None, filters, after=None
         ):
         """
         """
         query = self._build_query(
-            typename, order=order, limit=limit, offset=offset, filters=filters
+            typename, order=order, limit=limit, offset=offset, filters=filters,
+            after=after
         )
         return query.count()
 
-    def get(self, identifier, required=False):
+    def _primary_key_value(self, primary_key, resource_id):
+        """
+        Converts the *resource_id* to the Python type of the *primary_key*
+        column.
+
+        :raises ValueError: If the id is malformed.
         """
+        try:
+            python_type = primary_key.type.python_type
+        except NotImplementedError:
+            # The database converts the value.
+            return resource_id
+
+        try:
+            return python_type(resource_id)
+        except (TypeError, ValueError):
+            raise ValueError(resource_id)
+
+    def _get(self, identifier, required, options):
+        """
+        Loads the resource with the id *identifier* and the loader *options*
+        with :meth:`sqlalchemy.orm.Session.get`.
+
+        :arg tuple identifier:
+        :arg bool required:
+        :arg list options:
         """
         typename, resource_id = identifier
         resource_class = self.api.get_resource_class(typename)
-        resource = self.sqla_session.query(resource_class).get(resource_id)
-
-        if resource is None:
+        primary_key = sqlalchemy.inspect(resource_class).primary_key[0]
+
+        # Malformed ids can not exist in the database.
+        try:
+            key = self._primary_key_value(primary_key, resource_id)
+        except ValueError:
+            resource = None
+        else:
+            kargs = dict()
+            if self.compiled_cache is not None:
+                kargs["execution_options"] = {
+                    "compiled_cache": self.compiled_cache
+                }
+            resource = self.sqla_session.get(
+                resource_class, key, options=options, **kargs
+            )
+
+        if required and resource is None:
             raise jsonapi.base.errors.ResourceNotFound(identifier)
         return resource
 
+    def get(self, identifier, required=False):
+        """
+        Loads the resource and its relationships (:attr:`Schema.loader_options`).
+        """
+        schema_ = self.api.get_schema(identifier[0])
+        if isinstance(schema_, schema.Schema):
+            options = schema_.loader_options
+        else:
+            options = list()
+        return self._get(identifier, required, options)
+
     def get_many(self, identifiers, required=False):
         """
-        .. todo::
+        Loads the resources with one query per type. The relationships of the
+        resources are loaded eagerly (:attr:`Schema.loader_options`), so that
+        :meth:`get_relatives` needs only one query per relationship and
+        include level, instead of one (lazy) query per resource.
+        """
+        return self._get_many(identifiers, required)
 
-            Can we require them in a bulk?
+    def _get_many(self, identifiers, required, reuse_loaded=False):
+        """
+        Groups the *identifiers* by their type and calls
+        :meth:`_get_many_of_type` for each type.
         """
-        resources = {
-            identifier: self.get(identifier, required)\
-            for identifier in identifiers
-        }
+        by_type = dict()
+        for typename, resource_id in identifiers:
+            by_type.setdefault(typename, []).append(resource_id)
+
+        resources = dict()
+        for typename, resource_ids in by_type.items():
+            resources.update(self._get_many_of_type(
+                typename, resource_ids, required, reuse_loaded
+            ))
         return resources
 
+    def _get_many_of_type(self, typename, resource_ids, required,
+        reuse_loaded=False
+        ):
+        """
+        Loads all resources of the type *typename* with one query.
+
+        Resources, which are already in the identity map of the sqlalchemy
+        session and whose relationships have been loaded, are not queried
+        again. If *reuse_loaded* is true, all resources in the identity map
+        are reused, also if some of their relationships have not been loaded.
+
+        :arg str typename:
+        :arg list resource_ids:
+        :arg bool required:
+        :arg bool reuse_loaded:
+        """
+        resource_class = self.api.get_resource_class(typename)
+        schema_ = self.api.get_schema(typename)
+        mapper = sqlalchemy.inspect(resource_class)
+        primary_key = mapper.primary_key[0]
+
+        if isinstance(schema_, schema.Schema):
+            loader_options = schema_.loader_options
+            relnames = {
+                relationship.class_attr.key\
+                for relationship in schema_.relationships.values()\
+                if isinstance(relationship, (
+                    schema.ToOneRelationship, schema.ToManyRelationship
+                ))
+            }
+        else:
+            loader_options = list()
+            relnames = set()
+
+        # Map the ids to primary key values. Malformed ids can not exist in
+        # the database.
+        keys = dict()
+        for resource_id in resource_ids:
+            try:
+                keys[resource_id] = self._primary_key_value(
+                    primary_key, resource_id
+                )
+            except ValueError:
+                pass
+
+        # Look up the resources in the identity map first.
+        identity_map = self.sqla_session.identity_map
+        found = dict()
+        missing = list()
+        for key in set(keys.values()):
+            resource = identity_map.get(
+                mapper.identity_key_from_primary_key([key])
+            )
+            if resource is not None and (reuse_loaded or not \
+                relnames.intersection(sqlalchemy.inspect(resource).unloaded)
+                ):
+                found[key] = resource
+            else:
+                missing.append(key)
+
+        # Query the rest at once. Resources, which are already in the
+        # identity map, get their unloaded relationships too.
+        if missing:
+            query = self._query(resource_class)\
+                .filter(primary_key.in_(missing))\
+                .options(*loader_options)
+            for resource in query:
+                found[mapper.primary_key_from_instance(resource)[0]] = resource
+
+        result = dict()
+        for resource_id in resource_ids:
+            identifier = (typename, resource_id)
+            resource = found.get(keys.get(resource_id))
+            if required and resource is None:
+                raise jsonapi.base.errors.ResourceNotFound(identifier)
+            result[identifier] = resource
+        return result
+
+    def _include_loader(self, resource_class, path):
+        """
+        Returns a chain of *selectin* loader options for the relationships on
+        the include *path*. The chain stops at the first relationship, which
+        is not an sqlalchemy relationship.
+
+        :arg resource_class:
+        :arg list path:
+        """
+        loader = None
+        for relname in path:
+            schema_ = getattr(resource_class, "_jsonapi", {}).get("schema")
+            if not isinstance(schema_, schema.Schema):
+                break
+
+            relationship = schema_.relationships.get(relname)
+            if not isinstance(
+                relationship, (schema.ToOneRelationship, schema.ToManyRelationship)
+                ):
+                break
+
+            if loader is None:
+                loader = sqlalchemy.orm.selectinload(relationship.class_attr)
+            else:
+                loader = loader.selectinload(relationship.class_attr)
+            resource_class = relationship.class_attr.property.mapper.class_
+        return loader
+
+    def get_with_relatives(self, identifier, paths, required=False):
+        """
+        Loads the resource and the relationships on the include *paths* with
+        one query per relationship.
+        """
+        resource_class = self.api.get_resource_class(identifier[0])
+
+        loaders = [self._include_loader(resource_class, path) for path in paths]
+        loaders = [loader for loader in loaders if loader is not None]
+
+        resource = self._get(identifier, required, loaders)
+        if resource is None:
+            return (None, dict())
+
+        # The relationships on the paths have been loaded, so the relatives
+        # are taken from the identity map without further queries.
+        walk = walk_include_paths([resource], paths)
+        try:
+            missing = next(walk)
+            while True:
+                relatives = self._get_many(missing, True, reuse_loaded=True)
+                missing = walk.send(relatives)
+        except StopIteration as err:
+            return (resource, err.value)
+
     def save(self, resources):
         """
         """
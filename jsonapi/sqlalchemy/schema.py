@@ -34,6 +34,7 @@ import logging
 
 # third party
 import sqlalchemy
+import sqlalchemy.ext.hybrid
 
 # local
 import jsonapi
@@ -41,6 +42,7 @@ import jsonapi
 
 __all__ = [
     "Attribute",
+    "HybridAttribute",
     "IDAttribute",
     "ToOneRelationship",
     "ToManyRelationship",
@@ -77,6 +79,47 @@ class Attribute(jsonapi.base.schema.Attribute):
         return self.class_attr.__set__(resource, value)
 
 
+class HybridAttribute(Attribute):
+    """
+    Wraps an sqlalchemy hybrid property. The class level expression of the
+    hybrid property is used for filtering and sorting.
+
+    :arg resource_class:
+        The sqlalchemy model
+    :arg str name:
+        The name of the hybrid property
+    """
+
+    def __init__(self, resource_class, name):
+        """
+        """
+        jsonapi.base.schema.Attribute.__init__(self, name=name)
+        self.sqlattr = None
+        self.resource_class = resource_class
+        return None
+
+    @property
+    def class_attr(self):
+        """
+        The class level expression of the hybrid property. It is evaluated
+        lazily, since not every hybrid property has an SQL expression.
+        """
+        return getattr(self.resource_class, self.name)
+
+    def get(self, resource):
+        return getattr(resource, self.name)
+
+    def set(self, resource, value):
+        # A hybrid property without a setter is read-only.
+        descriptor = sqlalchemy.inspect(self.resource_class)\
+            .all_orm_descriptors[self.name]
+        if descriptor.fset is None:
+            raise jsonapi.base.errors.ReadOnlyAttribute(
+                detail="The attribute '{}' is read-only.".format(self.name)
+            )
+        return setattr(resource, self.name, value)
+
+
 class IDAttribute(jsonapi.base.schema.IDAttribute):
     """
     Wraps an sqlalchemy primary key. We only allow reading the id, but not
@@ -192,6 +235,12 @@ class Schema(jsonapi.base.schema.Schema):
         """
         """
         super().__init__(resource_class)
+
+        #: A list with the sqlalchemy loader options, which load all
+        #: relationships of the resource class eagerly (one query per
+        #: relationship instead of one query per resource).
+        self.loader_options = list()
+
         self.find_sqlalchemy_markers()
         return None
 
@@ -220,6 +269,9 @@ class Schema(jsonapi.base.schema.Schema):
                 rel = ToOneRelationship(self.resource_class, sql_rel)
                 self.relationships[rel.name] = rel
                 self.fields.add(rel.name)
+                self.loader_options.append(
+                    sqlalchemy.orm.selectinload(rel.class_attr)
+                )
 
             # *to-many*: MANYTOMANY, ONETOMANY
             elif sql_rel.direction in (
@@ -229,6 +281,9 @@ class Schema(jsonapi.base.schema.Schema):
                 rel = ToManyRelationship(self.resource_class, sql_rel)
                 self.relationships[rel.name] = rel
                 self.fields.add(rel.name)
+                self.loader_options.append(
+                    sqlalchemy.orm.selectinload(rel.class_attr)
+                )
 
         # Find all attributes
         for sql_attr in inspection.attrs.values():
@@ -243,6 +298,19 @@ class Schema(jsonapi.base.schema.Schema):
             self.attributes[attr.name] = attr
             self.fields.add(attr.name)
 
+        # Find the hybrid properties
+        for name, descriptor in inspection.all_orm_descriptors.items():
+            if not isinstance(descriptor, sqlalchemy.ext.hybrid.hybrid_property):
+                continue
+            if name.startswith("_"):
+                continue
+            if name in self.fields:
+                continue
+
+            attr = HybridAttribute(self.resource_class, name)
+            self.attributes[attr.name] = attr
+            self.fields.add(attr.name)
+
         # Use the primary id of the resource_class, if no id marker is set.
         if self.id_attribute is None:
             self.id_attribute = IDAttribute(self.resource_class)
@@ -37,6 +37,7 @@ import tornado.gen
 
 # local
 import jsonapi
+from jsonapi.base.utilities import document_size
 
 
 __all__ = [
@@ -44,6 +45,11 @@ __all__ = [
 ]
 
 
+#: The number of resource objects, which are encoded and sent as one chunk,
+#: if a large document is streamed to the client.
+STREAM_CHUNK_SIZE = 100
+
+
 class Handler(tornado.web.RequestHandler):
     """
     This handler works as proxy for the API. Each request is forwarded to
@@ -56,8 +62,7 @@ class Handler(tornado.web.RequestHandler):
         self.jsonapi = jsonapi
         return None
 
-    @asyncio.coroutine
-    def prepare(self):
+    async def prepare(self):
         """
         .. hint::
 
@@ -71,7 +76,7 @@ class Handler(tornado.web.RequestHandler):
         )
 
         # Let the API handle it.
-        resp = yield from self.jsonapi.handle_request(request)
+        resp = await self.jsonapi.handle_request(request)
 
         # Create the response.
         for key, value in resp.headers.items():
@@ -80,6 +85,21 @@ class Handler(tornado.web.RequestHandler):
 
         if resp.is_file:
             raise RuntimeError("Sorry, files are not yet supported :(")
+        elif resp.pending_document is not None:
+            # Stream the document (see TornadoAPI.write_document_async()).
+            # The chunks are encoded in the thread pool, so that the event
+            # loop is not blocked.
+            chunks = self.jsonapi.dump_json_stream(
+                resp.pending_document, STREAM_CHUNK_SIZE
+            )
+            executor = self.jsonapi.dump_json_executor
+            loop = asyncio.get_event_loop()
+            while True:
+                chunk = await loop.run_in_executor(executor, next, chunks, None)
+                if chunk is None:
+                    break
+                self.write(chunk)
+                await self.flush()
         elif resp.has_body:
             self.write(resp.body)
 
@@ -148,6 +168,26 @@ class TornadoAPI(jsonapi.asyncio.api.API):
         """
         return self._tornado_app
 
+    async def write_document_async(self, response, d):
+        """
+        Documents with more than :data:`STREAM_CHUNK_SIZE` resource objects
+        are not encoded at once. The handler encodes them chunk by chunk in
+        the thread pool and sends each chunk to the client, before the next
+        one is encoded. The *body* of the *response* is still available as
+        *bytes*, but encoded only on access.
+
+        Streaming is only used with :mod:`orjson` and not in the debug mode
+        (indented output).
+
+        :arg jsonapi.base.response.Response response:
+        :arg dict d:
+        """
+        if jsonapi.base.api.orjson is not None and not self.debug \
+            and document_size(d) > STREAM_CHUNK_SIZE:
+            response.set_document(d, self.dump_json)
+            return None
+        return await super().write_document_async(response, d)
+
     def init_app(self, app):
         """
         Registers the API handler on the tornado application.
@@ -164,6 +204,7 @@ class TornadoAPI(jsonapi.asyncio.api.API):
 
         self._tornado_app = app
         app.settings["jsonapi"] = self
+        self._invalidate_dispatcher()
 
         # Add the handler.
         url_rule = tornado.web.url(
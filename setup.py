@@ -54,6 +54,7 @@ setup(
         "jsonapi.base.handler",
         "jsonapi.asyncio",
         "jsonapi.asyncio.handler",
+        "jsonapi.bulk_database",
         "jsonapi.flask",
         "jsonapi.marker",
         "jsonapi.mongoengine",
@@ -65,6 +66,9 @@ setup(
     install_requires = [
         "cached_property"
     ],
+    extras_require = {
+        "orjson": ["orjson"]
+    },
     include_package_data = True,
     classifiers = [
         "Development Status :: 3 - Alpha",
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Benedikt Schmitt
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tests for :class:`jsonapi.base.serializer.Serializer`.
+"""
+
+# std
+import unittest
+
+# third party
+import sqlalchemy
+import sqlalchemy.orm
+
+# local
+import jsonapi
+import jsonapi.sqlalchemy
+
+
+Base = sqlalchemy.orm.declarative_base()
+
+
+class User(Base):
+    __tablename__ = "users"
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    name = sqlalchemy.Column(sqlalchemy.Text)
+    email = sqlalchemy.Column(sqlalchemy.Text)
+
+
+class Post(Base):
+    __tablename__ = "posts"
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    text = sqlalchemy.Column(sqlalchemy.Text)
+    author_id = sqlalchemy.Column(
+        sqlalchemy.Integer, sqlalchemy.ForeignKey("users.id")
+    )
+    author = sqlalchemy.orm.relationship(User)
+
+
+class ExtraSerializer(jsonapi.base.serializer.Serializer):
+    """
+    Adds an *extra* attribute to each resource.
+    """
+
+    def serialize_attributes(self, resource, fields=None):
+        d = super().serialize_attributes(resource, fields)
+        d["extra"] = True
+        return d
+
+
+class TestSerializer(unittest.TestCase):
+    """
+    Tests the compiled serializers and the fallback to the
+    *serialize_...()* methods of a subclass.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        Session = sqlalchemy.orm.sessionmaker(bind=engine)
+
+        db = jsonapi.sqlalchemy.Database(sessionmaker=Session)
+        self.api = jsonapi.base.api.API("/api", db)
+
+        user_schema = jsonapi.sqlalchemy.Schema(User)
+        self.api.add_type(
+            user_schema, serializer=ExtraSerializer(user_schema)
+        )
+        self.api.add_type(jsonapi.sqlalchemy.Schema(Post))
+
+        self.user = User(id=1, name="Anna", email="anna@example.org")
+        self.post = Post(id=2, text="Hello", author=self.user)
+
+        # The id is read from the identity key, so the resources must have
+        # been flushed.
+        self.session = Session()
+        self.session.add_all([self.user, self.post])
+        self.session.flush()
+        return None
+
+    def tearDown(self):
+        self.session.close()
+        return None
+
+    def serialize(self, resource, fields=None):
+        return resource._jsonapi["serializer"].serialize_resource(
+            resource, fields
+        )
+
+    def test_override(self):
+        d = self.serialize(self.user)
+        self.assertEqual(d["type"], "User")
+        self.assertEqual(d["id"], "1")
+        self.assertEqual(
+            dict(d["attributes"]),
+            {"name": "Anna", "email": "anna@example.org", "extra": True}
+        )
+        return None
+
+    def test_override_many(self):
+        d = jsonapi.base.serializer.serialize_many(
+            [self.user, self.post], {"User": ["name"]}
+        )
+        self.assertEqual(
+            dict(d[0]["attributes"]), {"name": "Anna", "extra": True}
+        )
+        self.assertNotIn("extra", d[1]["attributes"])
+        return None
+
+    def test_sparse_fieldset(self):
+        d = self.serialize(self.post, ["text"])
+        self.assertEqual(d, {
+            "type": "Post", "id": "2", "attributes": {"text": "Hello"}
+        })
+
+        d = self.serialize(self.post, ["author"])
+        self.assertEqual(d, {
+            "type": "Post", "id": "2",
+            "relationships": {
+                "author": {"data": {"type": "User", "id": "1"}}
+            }
+        })
+
+        d = self.serialize(self.post)
+        self.assertEqual(set(d["attributes"]), {"text"})
+        self.assertEqual(set(d["relationships"]), {"author"})
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()
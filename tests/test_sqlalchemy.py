@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# The MIT License (MIT)
+#
+# Copyright (c) 2016 Benedikt Schmitt
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tests for the :mod:`jsonapi.sqlalchemy` database adapter.
+"""
+
+# std
+import json
+import unittest
+
+# third party
+import sqlalchemy
+import sqlalchemy.orm
+
+# local
+import jsonapi
+import jsonapi.sqlalchemy
+
+
+Base = sqlalchemy.orm.declarative_base()
+
+
+class Post(Base):
+    __tablename__ = "posts"
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    text = sqlalchemy.Column(sqlalchemy.Text)
+
+
+class SQLAlchemyTestCase(unittest.TestCase):
+    """
+    Creates an API with five posts in an in-memory SQLite database.
+    """
+
+    def setUp(self):
+        engine = sqlalchemy.create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        Session = sqlalchemy.orm.sessionmaker(bind=engine)
+
+        session = Session()
+        session.add_all([Post(text="post %d" % i) for i in range(5)])
+        session.commit()
+        session.close()
+
+        db = jsonapi.sqlalchemy.Database(sessionmaker=Session)
+        self.api = jsonapi.base.api.API("/api", db)
+        self.api.add_type(jsonapi.sqlalchemy.Schema(Post))
+        return None
+
+    def request(self, uri):
+        request = jsonapi.base.Request(
+            "http://localhost" + uri, "GET",
+            {"content-type": "application/vnd.api+json"}, b""
+        )
+        response = self.api.handle_request(request)
+        return (response.status, json.loads(response.body))
+
+
+class TestPageAfter(SQLAlchemyTestCase):
+    """
+    Tests the keyset pagination with ``page[after]``.
+    """
+
+    def test_after(self):
+        status, d = self.request("/api/Post?page[after]=2&page[size]=2")
+        self.assertEqual(status, 200)
+        self.assertEqual([item["id"] for item in d["data"]], ["3", "4"])
+        return None
+
+    def test_after_not_an_integer(self):
+        status, d = self.request("/api/Post?page[after]=abc&page[size]=2")
+        self.assertEqual(status, 400)
+        self.assertEqual(d["errors"][0]["source"]["parameter"], "page[after]")
+        return None
+
+
+class TestGet(SQLAlchemyTestCase):
+    """
+    Tests :meth:`jsonapi.sqlalchemy.Session.get` and
+    :meth:`jsonapi.sqlalchemy.Session.get_with_relatives`.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.session = self.api.database.session()
+        return None
+
+    def tearDown(self):
+        self.session.sqla_session.close()
+        return None
+
+    def test_get(self):
+        post = self.session.get(("Post", "1"))
+        self.assertEqual(post.text, "post 0")
+        return None
+
+    def test_get_missing(self):
+        self.assertIsNone(self.session.get(("Post", "999")))
+        self.assertIsNone(self.session.get(("Post", "abc")))
+        with self.assertRaises(jsonapi.base.errors.ResourceNotFound):
+            self.session.get(("Post", "999"), required=True)
+        return None
+
+    def test_get_with_relatives_missing(self):
+        self.assertEqual(
+            self.session.get_with_relatives(("Post", "999"), []), (None, {})
+        )
+        with self.assertRaises(jsonapi.base.errors.ResourceNotFound):
+            self.session.get_with_relatives(("Post", "abc"), [], required=True)
+        return None
+
+
+if __name__ == "__main__":
+    unittest.main()